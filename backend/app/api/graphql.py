@@ -1,19 +1,35 @@
+import asyncio
+import base64
+import dataclasses
+import hashlib
+import json
 import strawberry
+from fastapi import Depends, Request
+from graphql import GraphQLError, parse
+from sqlalchemy import insert, select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from strawberry.extensions import AddValidationRules, MaxTokensLimiter, QueryDepthLimiter
 from strawberry.fastapi import GraphQLRouter
-from strawberry.types import Info
-from typing import List, Optional
+from strawberry.permission import BasePermission
+from strawberry.schema.execute import execute
+from strawberry.scalars import JSON
+from strawberry.types import ExecutionContext, ExecutionResult, Info
+from strawberry.types.graphql import OperationType
+from strawberry.types.nodes import SelectedField
+from strawberry.utils.str_converters import to_camel_case
+from strawberry.utils.operation import get_operation_type
+from typing import Any, Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
 from datetime import datetime
 import structlog
 
-from ..database.config import get_db
+from ..core import stats_counters  # noqa: F401  (registers dashboard counter listeners)
+from ..core.cache import cache
+from ..core.security import verify_token
+from ..database.config import AsyncSessionLocal, get_async_db
 from ..database.models import User, SensorReading, Loan, MarketplaceListing, CarbonCredit
-from .schemas import (
-    User as UserSchema,
-    SensorReading as SensorReadingSchema,
-    Loan as LoanSchema,
-    MarketplaceListing as MarketplaceListingSchema,
-    CarbonCredit as CarbonCreditSchema
-)
+from .loaders import create_loaders
+from .query_cost import cost_analysis_rule
 
 logger = structlog.get_logger()
 
@@ -32,6 +48,10 @@ class UserType:
     role: str
     created_at: datetime
 
+    @strawberry.field
+    async def loans(self, info: Info) -> List["LoanType"]:
+        return await info.context["user_loans_loader"].load(self.id)
+
 @strawberry.type
 class SensorReadingType:
     id: int
@@ -74,9 +94,14 @@ class LoanType:
     repaid_at: Optional[datetime]
     defaulted_at: Optional[datetime]
 
+    @strawberry.field
+    async def user(self, info: Info) -> Optional[UserType]:
+        return await info.context["user_loader"].load(self.user_id)
+
 @strawberry.type
 class MarketplaceListingType:
     id: int
+    seller_id: int
     title: str
     description: Optional[str]
     crop_type: str
@@ -88,14 +113,23 @@ class MarketplaceListingType:
     status: str
     created_at: datetime
 
+    @strawberry.field
+    async def seller(self, info: Info) -> Optional[UserType]:
+        return await info.context["user_loader"].load(self.seller_id)
+
 @strawberry.type
 class CarbonCreditType:
     id: int
+    user_id: int
     amount: float
     transaction_type: str
     transaction_hash: Optional[str]
     created_at: datetime
 
+    @strawberry.field
+    async def user(self, info: Info) -> Optional[UserType]:
+        return await info.context["user_loader"].load(self.user_id)
+
 # Input Types
 @strawberry.input
 class UserFilter:
@@ -183,6 +217,76 @@ class BridgeTransferType:
     tx_hash: Optional[str]
     created_at: datetime
 
+# Mock data for the enhanced-contract queries, built once at import rather than per call
+_MOCK_CREATED_AT = datetime.now()
+
+_STAKING_MOCK = StakingPositionType(
+    id="stake_1",
+    user_address="0x123...",
+    amount=1000.0,
+    lock_period=365,
+    apy=0.12,
+    rewards_earned=120.0,
+    start_time=_MOCK_CREATED_AT,
+    end_time=_MOCK_CREATED_AT,
+    status="active"
+)
+
+_PREDICTION_MARKETS_MOCK = [
+    PredictionMarketType(
+        id="market_1",
+        question="Will corn prices exceed $200/bushel in Q4 2024?",
+        outcomes=["Yes", "No"],
+        end_time=int(_MOCK_CREATED_AT.timestamp()) + 86400,
+        total_liquidity=5000.0,
+        resolved=False,
+        winning_outcome=None,
+        created_at=_MOCK_CREATED_AT
+    )
+]
+
+_LENDING_MOCK = LendingPositionType(
+    id="loan_1",
+    user_address="0x123...",
+    amount=5000.0,
+    interest_rate=0.08,
+    collateral_amount=6000.0,
+    collateral_token="USDC",
+    liquidation_price=0.83,
+    status="active",
+    created_at=_MOCK_CREATED_AT
+)
+
+_YIELD_STRATEGIES_MOCK = [
+    YieldStrategyType(
+        id="strategy_1",
+        name="Conservative Yield",
+        description="Low-risk yield farming strategy",
+        protocols=["aave", "compound"],
+        allocations=[60.0, 40.0],
+        expected_apy=0.08,
+        total_deposited=10000.0,
+        performance=0.075,
+        created_at=_MOCK_CREATED_AT
+    )
+]
+
+_BRIDGE_TRANSFER_MOCK = BridgeTransferType(
+    id="transfer_1",
+    user_address="0x123...",
+    amount=1000.0,
+    source_chain="ethereum",
+    target_chain="polygon",
+    recipient="0x456...",
+    status="completed",
+    tx_hash="0x789...",
+    created_at=_MOCK_CREATED_AT
+)
+
+def _for_address(mock, user_address: Optional[str]):
+    """The shared mock, or a copy carrying the caller's address"""
+    return dataclasses.replace(mock, user_address=user_address) if user_address else mock
+
 @strawberry.type
 class DashboardStatsType:
     total_users: int
@@ -191,10 +295,139 @@ class DashboardStatsType:
     active_marketplace_listings: int
     total_carbon_credits: int
 
+# Cursor pagination types
+Node = TypeVar("Node")
+
+@strawberry.type
+class PageInfo:
+    has_next_page: bool
+    end_cursor: Optional[str]
+
+@strawberry.type
+class Edge(Generic[Node]):
+    cursor: str
+    node: Node
+
+@strawberry.type
+class Connection(Generic[Node]):
+    edges: List[Edge[Node]]
+    page_info: PageInfo
+
+# Query helpers
+async def _execute(info: Info, stmt):
+    """Run a statement on the request session; AsyncSession forbids concurrent use"""
+    async with info.context["db_lock"]:
+        return await info.context["db"].execute(stmt)
+
+# Upper bound on rows a single list resolver may materialize; bulk reads go through
+# the streaming /sensor-data/{device_id}/export endpoint instead
+MAX_PAGE_SIZE = 500
+
+# Relationship fields resolved through DataLoaders and the column each one reads from its parent
+_RELATION_KEYS = {"seller": "seller_id", "user": "user_id", "loans": "id"}
+
+def _graphql_columns(model) -> Dict[str, Any]:
+    """GraphQL field name -> model attribute it reads, including relation foreign keys"""
+    columns = {
+        to_camel_case(column.key): getattr(model, column.key)
+        for column in model.__mapper__.column_attrs
+    }
+    for name, key in _RELATION_KEYS.items():
+        if hasattr(model, key):
+            columns.setdefault(name, getattr(model, key))
+    return columns
+
+# Built once at import so resolvers never reflect over the mapper per request
+_COLUMNS_BY_FIELD = {
+    model: _graphql_columns(model)
+    for model in (User, SensorReading, Loan, MarketplaceListing, CarbonCredit)
+}
+
+def _selected_names(selections: Iterable, path: Tuple[str, ...] = ()) -> Set[str]:
+    """Field names selected under `path`, looking through fragments and inline fragments"""
+    names: Set[str] = set()
+    for selection in selections:
+        if not isinstance(selection, SelectedField):
+            names |= _selected_names(selection.selections, path)
+        elif path:
+            if selection.name == path[0]:
+                names |= _selected_names(selection.selections, path[1:])
+        else:
+            names.add(selection.name)
+    return names
+
+def fields_to_columns(info: Info, model, path: Tuple[str, ...] = (), required: Iterable = ()) -> list:
+    """Map the client's selection set to the model columns needed to resolve it
+
+    `path` walks into wrapper types (("edges", "node") for connections); `required` adds
+    columns the resolver itself reads, such as the pagination sort column.
+    """
+    columns_by_name = _COLUMNS_BY_FIELD[model]
+    names = _selected_names(info.selected_fields[0].selections, path)
+
+    columns = {model.id.key: model.id}
+    for column in required:
+        columns[column.key] = column
+    for name in names:
+        attr = columns_by_name.get(name)
+        if attr is not None:
+            columns[attr.key] = attr
+    return list(columns.values())
+
+def _encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Opaque keyset cursor for a (sort column, id) position"""
+    return base64.urlsafe_b64encode(f"{sort_value.isoformat()}|{row_id}".encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        sort_value, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise GraphQLError("Invalid cursor")
+
+async def _paginate(info: Info, query, model, sort_column, limit: int, after: Optional[str]) -> Connection:
+    """Keyset pagination newest-first over (sort_column, id); page cost is O(limit) at any depth"""
+    if after:
+        query = query.where(tuple_(sort_column, model.id) < _decode_cursor(after))
+
+    result = await _execute(
+        info, query.order_by(sort_column.desc(), model.id.desc()).limit(limit + 1)
+    )
+    rows = result.scalars().all()
+    has_next_page = len(rows) > limit
+    rows = rows[:limit]
+
+    sort_key = sort_column.key
+    edges = [Edge(cursor=_encode_cursor(getattr(row, sort_key), row.id), node=row) for row in rows]
+    return Connection(
+        edges=edges,
+        page_info=PageInfo(
+            has_next_page=has_next_page,
+            end_cursor=edges[-1].cursor if edges else None
+        )
+    )
+
+async def _exists(info: Info, model, **filters) -> bool:
+    """Presence check as SELECT EXISTS(...): stops at the first match instead of counting them all"""
+    result = await _execute(info, select(select(model.id).filter_by(**filters).exists()))
+    return result.scalar()
+
+async def _count(model, *criteria) -> int:
+    """COUNT(*) on its own pooled session so independent counts can run concurrently"""
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(model).where(*criteria))
+
+class IsAuthenticated(BasePermission):
+    """Admit only requests whose bearer token resolved to an active user in get_context"""
+    message = "Authentication required"
+
+    def has_permission(self, source: Any, info: Info, **kwargs) -> bool:
+        return info.context.get("viewer_id") is not None
+
 # Query
 @strawberry.type
 class Query:
-    @strawberry.field
+    @strawberry.field(permission_classes=[IsAuthenticated])
     async def users(
         self,
         info: Info,
@@ -203,21 +436,24 @@ class Query:
         filter: Optional[UserFilter] = None
     ) -> List[UserType]:
         """Get users with optional filtering"""
-        db = next(get_db())
-
-        query = db.query(User)
+        limit = min(limit, MAX_PAGE_SIZE)
+        query = select(User).options(load_only(*fields_to_columns(info, User)))
 
         if filter:
             if filter.role:
-                query = query.filter(User.role == filter.role)
+                query = query.where(User.role == filter.role)
             if filter.is_verified is not None:
-                query = query.filter(User.is_verified == filter.is_verified)
+                query = query.where(User.is_verified == filter.is_verified)
             if filter.location:
-                query = query.filter(User.location.ilike(f"%{filter.location}%"))
+                query = query.where(User.location.ilike(f"%{filter.location}%"))
 
-        users = query.offset(offset).limit(limit).all()
+        result = await _execute(info, query.offset(offset).limit(limit))
+        users = result.scalars().all()
 
-        logger.info("GraphQL query: users", count=len(users), filter=filter)
+        logger.info("GraphQL query: users", count=len(users))
+        if filter:
+            # Filters are only rendered at debug level, keeping them off the hot INFO path
+            logger.debug("GraphQL query: users filter", filter=filter)
         return users
 
     @strawberry.field
@@ -225,25 +461,28 @@ class Query:
         self,
         info: Info,
         limit: int = 100,
-        offset: int = 0,
+        after: Optional[str] = None,
         filter: Optional[SensorDataFilter] = None
-    ) -> List[SensorReadingType]:
+    ) -> Connection[SensorReadingType]:
         """Get sensor readings with optional filtering"""
-        db = next(get_db())
-
-        query = db.query(SensorReading)
+        limit = min(limit, MAX_PAGE_SIZE)
+        query = select(SensorReading).options(load_only(
+            *fields_to_columns(info, SensorReading, ("edges", "node"), (SensorReading.timestamp,))
+        ))
 
         if filter:
             if filter.device_id:
-                query = query.filter(SensorReading.device_id == filter.device_id)
+                query = query.where(SensorReading.device_id == filter.device_id)
             if filter.start_date:
-                query = query.filter(SensorReading.timestamp >= filter.start_date)
+                query = query.where(SensorReading.timestamp >= filter.start_date)
             if filter.end_date:
-                query = query.filter(SensorReading.timestamp <= filter.end_date)
+                query = query.where(SensorReading.timestamp <= filter.end_date)
 
-        readings = query.order_by(SensorReading.timestamp.desc()).offset(offset).limit(limit).all()
+        readings = await _paginate(info, query, SensorReading, SensorReading.timestamp, limit, after)
 
-        logger.info("GraphQL query: sensor_readings", count=len(readings), filter=filter)
+        logger.info("GraphQL query: sensor_readings", count=len(readings.edges))
+        if filter:
+            logger.debug("GraphQL query: sensor_readings filter", filter=filter)
         return readings
 
     @strawberry.field
@@ -253,29 +492,28 @@ class Query:
         user_id: Optional[int] = None,
         status: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
-    ) -> List[LoanType]:
+        after: Optional[str] = None
+    ) -> Connection[LoanType]:
         """Get loans with optional filtering"""
-        db = next(get_db())
-
-        query = db.query(Loan)
+        limit = min(limit, MAX_PAGE_SIZE)
+        query = select(Loan).options(load_only(
+            *fields_to_columns(info, Loan, ("edges", "node"), (Loan.created_at,))
+        ))
 
         if user_id:
-            query = query.filter(Loan.user_id == user_id)
+            query = query.where(Loan.user_id == user_id)
         if status:
-            query = query.filter(Loan.status == status)
+            query = query.where(Loan.status == status)
 
-        loans = query.order_by(Loan.created_at.desc()).offset(offset).limit(limit).all()
+        loans = await _paginate(info, query, Loan, Loan.created_at, limit, after)
 
-        logger.info("GraphQL query: loans", count=len(loans), user_id=user_id, status=status)
+        logger.info("GraphQL query: loans", count=len(loans.edges), user_id=user_id, status=status)
         return loans
 
     @strawberry.field
     async def loan_details(self, info: Info, loan_id: int) -> Optional[LoanType]:
         """Get detailed loan information"""
-        db = next(get_db())
-
-        loan = db.query(Loan).filter(Loan.id == loan_id).first()
+        loan = await info.context["loan_loader"].load(loan_id)
 
         if loan:
             logger.info("GraphQL query: loan_details", loan_id=loan_id)
@@ -289,29 +527,32 @@ class Query:
         self,
         info: Info,
         limit: int = 50,
-        offset: int = 0,
+        after: Optional[str] = None,
         filter: Optional[MarketplaceFilter] = None
-    ) -> List[MarketplaceListingType]:
+    ) -> Connection[MarketplaceListingType]:
         """Get marketplace listings with optional filtering"""
-        db = next(get_db())
-
-        query = db.query(MarketplaceListing)
+        limit = min(limit, MAX_PAGE_SIZE)
+        query = select(MarketplaceListing).options(load_only(
+            *fields_to_columns(info, MarketplaceListing, ("edges", "node"), (MarketplaceListing.created_at,))
+        ))
 
         if filter:
             if filter.crop_type:
-                query = query.filter(MarketplaceListing.crop_type == filter.crop_type)
+                query = query.where(MarketplaceListing.crop_type == filter.crop_type)
             if filter.location:
-                query = query.filter(MarketplaceListing.location.ilike(f"%{filter.location}%"))
+                query = query.where(MarketplaceListing.location.ilike(f"%{filter.location}%"))
             if filter.min_price:
-                query = query.filter(MarketplaceListing.price_per_unit >= filter.min_price)
+                query = query.where(MarketplaceListing.price_per_unit >= filter.min_price)
             if filter.max_price:
-                query = query.filter(MarketplaceListing.price_per_unit <= filter.max_price)
+                query = query.where(MarketplaceListing.price_per_unit <= filter.max_price)
             if filter.status:
-                query = query.filter(MarketplaceListing.status == filter.status)
+                query = query.where(MarketplaceListing.status == filter.status)
 
-        listings = query.order_by(MarketplaceListing.created_at.desc()).offset(offset).limit(limit).all()
+        listings = await _paginate(info, query, MarketplaceListing, MarketplaceListing.created_at, limit, after)
 
-        logger.info("GraphQL query: marketplace_listings", count=len(listings), filter=filter)
+        logger.info("GraphQL query: marketplace_listings", count=len(listings.edges))
+        if filter:
+            logger.debug("GraphQL query: marketplace_listings filter", filter=filter)
         return listings
 
     @strawberry.field
@@ -320,32 +561,43 @@ class Query:
         info: Info,
         user_id: Optional[int] = None,
         limit: int = 50,
-        offset: int = 0
-    ) -> List[CarbonCreditType]:
+        after: Optional[str] = None
+    ) -> Connection[CarbonCreditType]:
         """Get carbon credits, optionally filtered by user"""
-        db = next(get_db())
-
-        query = db.query(CarbonCredit)
+        limit = min(limit, MAX_PAGE_SIZE)
+        query = select(CarbonCredit).options(load_only(
+            *fields_to_columns(info, CarbonCredit, ("edges", "node"), (CarbonCredit.created_at,))
+        ))
 
         if user_id:
-            query = query.filter(CarbonCredit.user_id == user_id)
+            query = query.where(CarbonCredit.user_id == user_id)
 
-        credits = query.order_by(CarbonCredit.created_at.desc()).offset(offset).limit(limit).all()
+        credits = await _paginate(info, query, CarbonCredit, CarbonCredit.created_at, limit, after)
 
-        logger.info("GraphQL query: carbon_credits", count=len(credits), user_id=user_id)
+        logger.info("GraphQL query: carbon_credits", count=len(credits.edges), user_id=user_id)
         return credits
 
     @strawberry.field
     async def dashboard_stats(self, info: Info) -> DashboardStatsType:
         """Get dashboard statistics"""
-        db = next(get_db())
-
-        # Get various stats
-        total_users = db.query(User).count()
-        active_loans = db.query(Loan).filter(Loan.status == "active").count()
-        total_sensor_readings = db.query(SensorReading).count()
-        active_listings = db.query(MarketplaceListing).filter(MarketplaceListing.status == "active").count()
-        total_carbon_credits = db.query(CarbonCredit).count()
+        counters = await cache.get_dashboard_stats()
+        if counters:
+            return DashboardStatsType(**counters)
+
+        # Cold start: seed the Redis counters from the tables
+        (
+            total_users,
+            active_loans,
+            total_sensor_readings,
+            active_listings,
+            total_carbon_credits,
+        ) = await asyncio.gather(
+            _count(User),
+            _count(Loan, Loan.status == "active"),
+            _count(SensorReading),
+            _count(MarketplaceListing, MarketplaceListing.status == "active"),
+            _count(CarbonCredit),
+        )
 
         stats = DashboardStatsType(
             total_users=total_users,
@@ -354,6 +606,7 @@ class Query:
             active_marketplace_listings=active_listings,
             total_carbon_credits=total_carbon_credits
         )
+        await cache.seed_dashboard_stats(vars(stats))
 
         logger.info("GraphQL query: dashboard_stats", total_users=total_users)
         return stats
@@ -369,19 +622,7 @@ class Query:
         """Get staking positions"""
         # This would query the database or blockchain
         # For now, return mock data
-        return [
-            StakingPositionType(
-                id="stake_1",
-                user_address=user_address or "0x123...",
-                amount=1000.0,
-                lock_period=365,
-                apy=0.12,
-                rewards_earned=120.0,
-                start_time=datetime.now(),
-                end_time=datetime.now(),
-                status="active"
-            )
-        ]
+        return [_for_address(_STAKING_MOCK, user_address)]
 
     @strawberry.field
     async def prediction_markets(
@@ -392,18 +633,7 @@ class Query:
     ) -> List[PredictionMarketType]:
         """Get prediction markets"""
         # Mock data
-        return [
-            PredictionMarketType(
-                id="market_1",
-                question="Will corn prices exceed $200/bushel in Q4 2024?",
-                outcomes=["Yes", "No"],
-                end_time=int(datetime.now().timestamp()) + 86400,
-                total_liquidity=5000.0,
-                resolved=False,
-                winning_outcome=None,
-                created_at=datetime.now()
-            )
-        ]
+        return _PREDICTION_MARKETS_MOCK
 
     @strawberry.field
     async def lending_positions(
@@ -414,19 +644,7 @@ class Query:
     ) -> List[LendingPositionType]:
         """Get lending positions"""
         # Mock data
-        return [
-            LendingPositionType(
-                id="loan_1",
-                user_address=user_address or "0x123...",
-                amount=5000.0,
-                interest_rate=0.08,
-                collateral_amount=6000.0,
-                collateral_token="USDC",
-                liquidation_price=0.83,
-                status="active",
-                created_at=datetime.now()
-            )
-        ]
+        return [_for_address(_LENDING_MOCK, user_address)]
 
     @strawberry.field
     async def yield_strategies(
@@ -437,19 +655,7 @@ class Query:
     ) -> List[YieldStrategyType]:
         """Get yield strategies"""
         # Mock data
-        return [
-            YieldStrategyType(
-                id="strategy_1",
-                name="Conservative Yield",
-                description="Low-risk yield farming strategy",
-                protocols=["aave", "compound"],
-                allocations=[60.0, 40.0],
-                expected_apy=0.08,
-                total_deposited=10000.0,
-                performance=0.075,
-                created_at=datetime.now()
-            )
-        ]
+        return _YIELD_STRATEGIES_MOCK
 
     @strawberry.field
     async def bridge_transfers(
@@ -460,21 +666,7 @@ class Query:
     ) -> List[BridgeTransferType]:
         """Get bridge transfers"""
         # Mock data
-        return [
-            BridgeTransferType(
-                id="transfer_1",
-                user_address=user_address or "0x123...",
-                amount=1000.0,
-                source_chain="ethereum",
-                target_chain="polygon",
-                recipient="0x456...",
-                status="completed",
-                tx_hash="0x789...",
-                created_at=datetime.now()
-            )
-        ]
-
-# Types moved before Query class
+        return [_for_address(_BRIDGE_TRANSFER_MOCK, user_address)]
 
 # Input Types for New Mutations
 @strawberry.input
@@ -508,10 +700,53 @@ class BridgeTransferInput:
     target_chain: int
     recipient: str
 
+# Mutation result types; AI analyses keep their service-defined shape as JSON
+@strawberry.type
+class LoanApplicationResult:
+    success: bool
+    message: str
+    loan_id: Optional[int]
+
+@strawberry.type
+class LoanRepaymentResult:
+    success: bool
+    message: str
+    remaining_balance: float
+
+@strawberry.type
+class StakingResult:
+    success: bool
+    tx_hash: Optional[str]
+    ai_prediction: JSON
+
+@strawberry.type
+class PredictionMarketResult:
+    success: bool
+    market_id: Optional[strawberry.ID]
+    ai_analysis: JSON
+
+@strawberry.type
+class LendingResult:
+    success: bool
+    loan_id: Optional[strawberry.ID]
+    risk_assessment: JSON
+
+@strawberry.type
+class YieldStrategyResult:
+    success: bool
+    strategy_id: Optional[strawberry.ID]
+    ai_optimization: JSON
+
+@strawberry.type
+class BridgeTransferResult:
+    success: bool
+    transfer_id: Optional[strawberry.ID]
+    tx_hash: Optional[str]
+
 # Mutations
 @strawberry.type
 class Mutation:
-    @strawberry.mutation
+    @strawberry.mutation(permission_classes=[IsAuthenticated])
     async def create_marketplace_listing(
         self,
         info: Info,
@@ -525,13 +760,16 @@ class Mutation:
         quality_grade: Optional[str]
     ) -> MarketplaceListingType:
         """Create a new marketplace listing"""
-        db = next(get_db())
+        db = info.context["db"]
+        lock = info.context["db_lock"]
+
+        user_id = info.context["viewer_id"]
 
-        # Get current user from context (would need to be set up properly)
-        # For now, assume user_id = 1
-        user_id = 1
+        if not await _exists(info, User, id=user_id):
+            raise GraphQLError("Seller not found")
 
-        listing = MarketplaceListing(
+        # INSERT ... RETURNING hands back the row in the same round trip, no refresh SELECT
+        stmt = insert(MarketplaceListing).values(
             seller_id=user_id,
             title=title,
             description=description,
@@ -541,131 +779,131 @@ class Mutation:
             price_per_unit=price_per_unit,
             location=location,
             quality_grade=quality_grade
-        )
+        ).returning(MarketplaceListing)
+
+        async with lock:
+            listing = (await db.execute(stmt)).scalar_one()
+            await db.commit()
 
-        db.add(listing)
-        db.commit()
-        db.refresh(listing)
+        # Statement inserts bypass mapper events, so bump the dashboard counter here
+        if listing.status == "active":
+            cache.incr_dashboard_stat("active_marketplace_listings")
 
         logger.info("GraphQL mutation: create_marketplace_listing", listing_id=listing.id)
         return listing
 
-    @strawberry.mutation
+    @strawberry.mutation(permission_classes=[IsAuthenticated])
     async def apply_for_loan(
         self,
         info: Info,
         amount: float,
         collateral_token: str,
         collateral_amount: float,
-        farmer_data: dict,
+        farmer_data: JSON,
         purpose: Optional[str] = None
-    ) -> dict:
+    ) -> LoanApplicationResult:
         """Apply for a loan with AI credit scoring"""
         # This would integrate with LoanManagerService
         # For now, return mock response
-        return {
-            "success": True,
-            "message": "Loan application submitted for review",
-            "loan_id": 123
-        }
+        return LoanApplicationResult(
+            success=True,
+            message="Loan application submitted for review",
+            loan_id=123
+        )
 
-    @strawberry.mutation
+    @strawberry.mutation(permission_classes=[IsAuthenticated])
     async def repay_loan(
         self,
         info: Info,
         loan_id: int,
         amount: float
-    ) -> dict:
+    ) -> LoanRepaymentResult:
         """Make a loan repayment"""
         # This would integrate with LoanManagerService
         # For now, return mock response
-        return {
-            "success": True,
-            "message": f"Repayment of {amount} processed",
-            "remaining_balance": 0.0
-        }
+        return LoanRepaymentResult(
+            success=True,
+            message=f"Repayment of {amount} processed",
+            remaining_balance=0.0
+        )
 
     # New Enhanced Contract Mutations
-    @strawberry.mutation
+    @strawberry.mutation(permission_classes=[IsAuthenticated])
     async def stake_tokens(
         self,
         info: Info,
         input: StakingInput
-    ) -> dict:
+    ) -> StakingResult:
         """Stake tokens for rewards"""
         from ..core.blockchain import blockchain_service
         from ..core.advanced_ai import advanced_ai_service
 
-        # Get AI predictions
-        ai_prediction = await advanced_ai_service.predict_staking_rewards(
-            input.amount, input.lock_period, []
+        # The AI prediction and the staking transaction are independent, so run them concurrently
+        ai_prediction, result = await asyncio.gather(
+            advanced_ai_service.predict_staking_rewards(input.amount, input.lock_period, []),
+            blockchain_service.stake_tokens(input.amount, input.lock_period)
         )
 
-        # Execute staking
-        result = await blockchain_service.stake_tokens(input.amount, input.lock_period)
-
-        return {
-            "success": result.get("success", False),
-            "tx_hash": result.get("tx_hash"),
-            "ai_prediction": ai_prediction
-        }
+        return StakingResult(
+            success=result.get("success", False),
+            tx_hash=result.get("tx_hash"),
+            ai_prediction=ai_prediction
+        )
 
-    @strawberry.mutation
+    @strawberry.mutation(permission_classes=[IsAuthenticated])
     async def create_prediction_market(
         self,
         info: Info,
         input: PredictionMarketInput
-    ) -> dict:
+    ) -> PredictionMarketResult:
         """Create a prediction market"""
         from ..core.blockchain import blockchain_service
         from ..core.advanced_ai import advanced_ai_service
 
-        # Get AI analysis
-        ai_analysis = await advanced_ai_service.predict_market_outcomes(
-            input.question, input.outcomes, []
+        # Get AI analysis while the market is created
+        ai_analysis, result = await asyncio.gather(
+            advanced_ai_service.predict_market_outcomes(input.question, input.outcomes, []),
+            blockchain_service.create_market(
+                input.question, input.outcomes, input.end_time, input.fee
+            )
         )
 
-        # Create market
-        result = await blockchain_service.create_market(
-            input.question, input.outcomes, input.end_time, input.fee
+        return PredictionMarketResult(
+            success=result.get("success", False),
+            market_id=result.get("market_id"),
+            ai_analysis=ai_analysis
         )
 
-        return {
-            "success": result.get("success", False),
-            "market_id": result.get("market_id"),
-            "ai_analysis": ai_analysis
-        }
-
-    @strawberry.mutation
+    @strawberry.mutation(permission_classes=[IsAuthenticated])
     async def lend_tokens(
         self,
         info: Info,
         input: LendingInput
-    ) -> dict:
+    ) -> LendingResult:
         """Lend tokens in lending protocol"""
         from ..core.blockchain import blockchain_service
         from ..core.advanced_ai import advanced_ai_service
 
-        # Get AI risk assessment
-        risk_assessment = await advanced_ai_service.assess_lending_risk(
-            {}, input.amount, input.collateral_amount  # TODO: Add borrower data
+        # Get AI risk assessment while the loan is executed
+        risk_assessment, result = await asyncio.gather(
+            advanced_ai_service.assess_lending_risk(
+                {}, input.amount, input.collateral_amount  # TODO: Add borrower data
+            ),
+            blockchain_service.lend_tokens(input.amount, 0.08)  # Default rate
         )
 
-        # Execute lending
-        result = await blockchain_service.lend_tokens(input.amount, 0.08)  # Default rate
-
-        return {
-            "success": result.get("success", False),
-            "loan_id": result.get("loan_id"),
-            "risk_assessment": risk_assessment
-        }
+        return LendingResult(
+            success=result.get("success", False),
+            loan_id=result.get("loan_id"),
+            risk_assessment=risk_assessment
+        )
 
-    @strawberry.mutation
+    @strawberry.mutation(permission_classes=[IsAuthenticated])
     async def create_yield_strategy(
         self,
         info: Info,
         input: YieldStrategyInput
-    ) -> dict:
+    ) -> YieldStrategyResult:
         """Create yield aggregation strategy"""
         from ..core.blockchain import blockchain_service
         from ..core.advanced_ai import advanced_ai_service
@@ -675,7 +913,7 @@ class Mutation:
             input.protocols, "medium", 1000, 90  # Default values
         )
 
-        # Use AI-optimized allocations
+        # Allocations depend on the AI output, so this call stays ahead of the chain call
         allocations = [int(ai_optimization["optimal_allocations"].get(p, 0))
                       for p in input.protocols]
 
@@ -684,18 +922,18 @@ class Mutation:
             input.name, input.description, input.protocols, allocations
         )
 
-        return {
-            "success": result.get("success", False),
-            "strategy_id": result.get("strategy_id"),
-            "ai_optimization": ai_optimization
-        }
+        return YieldStrategyResult(
+            success=result.get("success", False),
+            strategy_id=result.get("strategy_id"),
+            ai_optimization=ai_optimization
+        )
 
-    @strawberry.mutation
+    @strawberry.mutation(permission_classes=[IsAuthenticated])
     async def initiate_bridge_transfer(
         self,
         info: Info,
         input: BridgeTransferInput
-    ) -> dict:
+    ) -> BridgeTransferResult:
         """Initiate cross-chain bridge transfer"""
         from ..core.blockchain import blockchain_service
 
@@ -704,14 +942,152 @@ class Mutation:
             input.amount, input.target_chain, input.recipient
         )
 
-        return {
-            "success": result.get("success", False),
-            "transfer_id": result.get("transfer_id"),
-            "tx_hash": result.get("tx_hash")
-        }
+        return BridgeTransferResult(
+            success=result.get("success", False),
+            transfer_id=result.get("transfer_id"),
+            tx_hash=result.get("tx_hash")
+        )
+
+# Create GraphQL schema. Depth, token and cost limits run in the validate phase,
+# so pathological queries are rejected before any resolver touches the database.
+MAX_QUERY_DEPTH = 8
+MAX_QUERY_TOKENS = 3000
+MAX_QUERY_COST = 1000
+
+schema = strawberry.Schema(
+    query=Query,
+    mutation=Mutation,
+    extensions=[
+        QueryDepthLimiter(max_depth=MAX_QUERY_DEPTH),
+        MaxTokensLimiter(max_token_count=MAX_QUERY_TOKENS),
+        AddValidationRules([cost_analysis_rule(max_cost=MAX_QUERY_COST, max_list_size=MAX_PAGE_SIZE)]),
+    ],
+)
+
+async def _viewer_id(request: Request, db: AsyncSession) -> Optional[int]:
+    """Id of the active user named by the request's bearer token, or None"""
+    scheme, _, token = (request.headers.get("authorization") or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    username = verify_token(token)
+    if username is None:
+        return None
+    return await db.scalar(select(User.id).where(User.username == username, User.is_active.is_(True)))
+
+# Request-scoped context: one AsyncSession per HTTP request, closed when the request ends.
+# Fields resolve concurrently, so statements on the shared session are serialized by db_lock.
+# DataLoaders are rebuilt per request so their caches never leak across users.
+# viewer_id is None for anonymous requests; IsAuthenticated fields reject those.
+async def get_context(request: Request, db: AsyncSession = Depends(get_async_db)) -> dict:
+    lock = asyncio.Lock()
+    viewer_id = await _viewer_id(request, db)
+    return {"db": db, "db_lock": lock, "viewer_id": viewer_id, **create_loaders(db, lock)}
+
+class CachedGraphQLRouter(GraphQLRouter):
+    """GraphQL router with automatic persisted queries and a short-lived query result cache
+
+    Clients may send only `extensions.persistedQuery.sha256Hash`; the document is looked up
+    in Redis and registered the first time it is sent in full. Read-only query results are
+    cached for a few seconds under sha256(query, variables, operation name, viewer), so repeated
+    dashboard/mobile polls skip validation and execution entirely.
+    """
+
+    async def execute_operation(
+        self, request: Request, context: Any, root_value: Optional[Any]
+    ) -> ExecutionResult:
+        if request.method != "POST" or "application/json" not in (request.headers.get("content-type") or ""):
+            return await super().execute_operation(request, context, root_value)
+
+        try:
+            payload = json.loads(await request.body())
+        except json.JSONDecodeError:
+            return await super().execute_operation(request, context, root_value)
+        if not isinstance(payload, dict):
+            return await super().execute_operation(request, context, root_value)
+
+        query = payload.get("query")
+        variables = payload.get("variables")
+        operation_name = payload.get("operationName")
+
+        persisted = (payload.get("extensions") or {}).get("persistedQuery") or {}
+        query_hash = persisted.get("sha256Hash")
+        if query_hash:
+            if query is None:
+                query = await cache.get_persisted_query(query_hash)
+                if query is None:
+                    return ExecutionResult(
+                        data=None,
+                        errors=[GraphQLError(
+                            "PersistedQueryNotFound",
+                            extensions={"code": "PERSISTED_QUERY_NOT_FOUND"}
+                        )]
+                    )
+            elif hashlib.sha256(query.encode()).hexdigest() != query_hash:
+                return ExecutionResult(
+                    data=None,
+                    errors=[GraphQLError("provided sha does not match query")]
+                )
+            else:
+                await cache.set_persisted_query(query_hash, query)
+
+        if not query:
+            return await super().execute_operation(request, context, root_value)
+
+        try:
+            # Parsed once: the document picks the operation type and is then executed as is.
+            # The token cap is the one MaxTokensLimiter would apply.
+            document = parse(query, max_tokens=MAX_QUERY_TOKENS)
+            operation_type = get_operation_type(document, operation_name)
+        except (GraphQLError, RuntimeError):
+            # Syntax errors and unknown operation names are reported by the regular execution
+            return await self.schema.execute(
+                query,
+                root_value=root_value,
+                variable_values=variables,
+                context_value=context,
+                operation_name=operation_name,
+                allowed_operation_types=OperationType.from_http("POST"),
+            )
 
-# Create GraphQL schema
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+        # Mutations are never cached. Results can depend on the viewer, so the key includes it.
+        result_key = None
+        if operation_type == OperationType.QUERY:
+            result_key = hashlib.sha256(json.dumps(
+                [query, variables, operation_name, context.get("viewer_id")], sort_keys=True
+            ).encode()).hexdigest()
+            cached = await cache.get_query_result(result_key)
+            if cached is not None:
+                return ExecutionResult(data=cached, errors=None)
+
+        result = await self._execute_document(document, query, variables, operation_name, context, root_value)
+
+        if result_key is not None and not result.errors:
+            await cache.set_query_result(result_key, result.data)
+
+        return result
+
+    async def _execute_document(
+        self, document, query: str, variables: Optional[Dict[str, Any]],
+        operation_name: Optional[str], context: Any, root_value: Optional[Any]
+    ) -> ExecutionResult:
+        """Schema.execute for an already parsed document, so strawberry doesn't parse it again"""
+        execution_context = ExecutionContext(
+            query=query,
+            schema=self.schema,
+            context=context,
+            root_value=root_value,
+            variables=variables,
+            provided_operation_name=operation_name,
+            graphql_document=document,
+        )
+        return await execute(
+            self.schema._schema,
+            extensions=self.schema.get_extensions(),
+            execution_context_class=self.schema.execution_context_class,
+            execution_context=execution_context,
+            allowed_operation_types=OperationType.from_http("POST"),
+            process_errors=self.schema._process_errors,
+        )
 
 # Create GraphQL router
-graphql_app = GraphQLRouter(schema)
\ No newline at end of file
+graphql_app = CachedGraphQLRouter(schema, context_getter=get_context)
\ No newline at end of file
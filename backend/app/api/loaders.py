@@ -0,0 +1,49 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from strawberry.dataloader import DataLoader
+
+from ..database.models import User, Loan, MarketplaceListing, CarbonCredit
+
+
+def _batch_load_by_id(db: AsyncSession, lock: asyncio.Lock, model):
+    """Build a batch function loading `model` rows by primary key in one query"""
+    async def load(ids: List[int]) -> List[Optional[object]]:
+        async with lock:
+            result = await db.execute(select(model).where(model.id.in_(ids)))
+        by_id = {row.id: row for row in result.scalars()}
+        # DataLoader requires results in the same order as the requested keys
+        return [by_id.get(key) for key in ids]
+
+    return load
+
+
+def _batch_load_loans_by_user(db: AsyncSession, lock: asyncio.Lock):
+    """Build a batch function loading every loan for a set of users in one query"""
+    async def load(user_ids: List[int]) -> List[List[Loan]]:
+        async with lock:
+            result = await db.execute(
+                select(Loan)
+                .where(Loan.user_id.in_(user_ids))
+                .order_by(Loan.created_at.desc())
+            )
+        grouped: Dict[int, List[Loan]] = defaultdict(list)
+        for row in result.scalars():
+            grouped[row.user_id].append(row)
+        return [grouped.get(key, []) for key in user_ids]
+
+    return load
+
+
+def create_loaders(db: AsyncSession, lock: asyncio.Lock) -> dict:
+    """Create request-scoped DataLoaders bound to the request's session"""
+    return {
+        "user_loader": DataLoader(load_fn=_batch_load_by_id(db, lock, User)),
+        "loan_loader": DataLoader(load_fn=_batch_load_by_id(db, lock, Loan)),
+        "marketplace_listing_loader": DataLoader(load_fn=_batch_load_by_id(db, lock, MarketplaceListing)),
+        "carbon_credit_loader": DataLoader(load_fn=_batch_load_by_id(db, lock, CarbonCredit)),
+        "user_loans_loader": DataLoader(load_fn=_batch_load_loans_by_user(db, lock)),
+    }
@@ -0,0 +1,124 @@
+from typing import Optional, Set, Type
+
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    ValidationRule,
+    get_named_type,
+    get_nullable_type,
+    is_leaf_type,
+    is_list_type,
+)
+
+# Multiplier for list fields that take no `limit` argument (e.g. `User.loans`)
+UNBOUNDED_LIST_COST = 10
+
+
+def cost_analysis_rule(max_cost: int, max_list_size: Optional[int] = None) -> Type[ValidationRule]:
+    """Build a validation rule rejecting operations whose estimated cost exceeds `max_cost`
+
+    Every object field costs 1 and leaf fields are free. A list field taking a `limit`
+    argument multiplies the cost of everything below it by that limit; a connection
+    applies it to its `edges` list only (its schema default when omitted, `max_list_size`
+    when passed as a variable since its value is not known at validation time, and capped
+    at `max_list_size` like the resolvers cap it). Other object lists multiply by
+    UNBOUNDED_LIST_COST.
+    """
+
+    class QueryCostRule(ValidationRule):
+        def enter_operation_definition(self, node: OperationDefinitionNode, *_args):
+            root = self.context.schema.get_root_type(node.operation)
+            if root is None:
+                return
+            cost = self._selection_cost(node.selection_set, root, rows=None, fragments=set())
+            if cost > max_cost:
+                self.report_error(
+                    GraphQLError(
+                        f"Query cost {cost} exceeds the maximum allowed cost of {max_cost}",
+                        node,
+                    )
+                )
+
+        def _selection_cost(
+            self,
+            selection_set: Optional[SelectionSetNode],
+            parent_type: GraphQLObjectType,
+            rows: Optional[int],
+            fragments: Set[str],
+        ) -> int:
+            if selection_set is None:
+                return 0
+            cost = 0
+            for selection in selection_set.selections:
+                if isinstance(selection, FieldNode):
+                    cost += self._field_cost(selection, parent_type, rows, fragments)
+                elif isinstance(selection, InlineFragmentNode):
+                    cost += self._selection_cost(selection.selection_set, parent_type, rows, fragments)
+                elif isinstance(selection, FragmentSpreadNode):
+                    name = selection.name.value
+                    fragment = self.context.get_fragment(name)
+                    # Fragment cycles are reported by the standard NoFragmentCycles rule
+                    if fragment is None or name in fragments:
+                        continue
+                    cost += self._selection_cost(
+                        fragment.selection_set, parent_type, rows, fragments | {name}
+                    )
+            return cost
+
+        def _field_cost(
+            self,
+            node: FieldNode,
+            parent_type: GraphQLObjectType,
+            rows: Optional[int],
+            fragments: Set[str],
+        ) -> int:
+            field_def = getattr(parent_type, "fields", {}).get(node.name.value)
+            if field_def is None:
+                return 0
+            field_type = get_named_type(field_def.type)
+            if is_leaf_type(field_type):
+                return 0
+
+            own_cost, multiplier, child_rows = 1, 1, None
+            is_list = is_list_type(get_nullable_type(field_def.type))
+            if "limit" in field_def.args:
+                limit = _limit_value(node, field_def.args["limit"].default_value, max_list_size)
+                if max_list_size is not None:
+                    limit = min(limit, max_list_size)
+                if is_list:
+                    multiplier = limit
+                else:
+                    # Connection: its edges carry the rows, pageInfo is fetched once
+                    child_rows = limit
+            elif is_list:
+                if rows is not None:
+                    # Connection edges: one row per item the parent's `limit` allows
+                    own_cost, multiplier = 0, rows
+                else:
+                    multiplier = UNBOUNDED_LIST_COST
+
+            return own_cost + multiplier * self._selection_cost(node.selection_set, field_type, child_rows, fragments)
+
+    return QueryCostRule
+
+
+def _limit_value(node: FieldNode, default, max_list_size: Optional[int]) -> int:
+    """Read a literal `limit` argument, assuming the worst case for variables
+
+    An omitted `limit` falls back to the schema default.
+    """
+    for argument in node.arguments or ():
+        if argument.name.value != "limit":
+            continue
+        if isinstance(argument.value, IntValueNode):
+            return max(int(argument.value.value), 1)
+        if max_list_size is not None:
+            return max_list_size
+        break
+    return default if isinstance(default, int) and default > 0 else 1
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, EmailStr
+import msgspec
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -28,8 +29,7 @@ class User(UserBase):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Authentication schemas
 class Token(BaseModel):
@@ -61,13 +61,40 @@ class SensorReadingCreate(SensorReadingBase):
     device_id: str
     timestamp: Optional[datetime] = None
 
+# Wire format of SensorReadingCreate for the high-rate ingest endpoints. msgspec decodes
+# straight from the request bytes, skipping the intermediate dict and Pydantic model.
+class SensorReadingPayload(msgspec.Struct, frozen=True, kw_only=True):
+    device_id: str
+    soil_moisture: float
+    temperature: float
+    humidity: float
+    light_level: float
+    ph_level: Optional[float] = None
+    nitrogen: Optional[float] = None
+    phosphorus: Optional[float] = None
+    potassium: Optional[float] = None
+    rainfall: Optional[float] = None
+    wind_speed: Optional[float] = None
+    solar_radiation: Optional[float] = None
+    timestamp: Optional[datetime] = None
+
+    def measurements(self) -> Dict[str, Optional[float]]:
+        """Sensor values keyed by SensorReading column (everything but device_id and timestamp)"""
+        return {name: getattr(self, name) for name in SENSOR_MEASUREMENT_FIELDS}
+
+SENSOR_MEASUREMENT_FIELDS = tuple(SensorReadingBase.model_fields)
+
+# Decoders are compiled once at import and reused for every request. strict=False keeps
+# the coercions SensorReadingCreate allowed, such as numeric strings and epoch timestamps.
+sensor_reading_decoder = msgspec.json.Decoder(SensorReadingPayload, strict=False)
+sensor_reading_batch_decoder = msgspec.json.Decoder(List[SensorReadingPayload], strict=False)
+
 class SensorReading(SensorReadingBase):
     id: int
     device_id: str
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class SensorDeviceBase(BaseModel):
     device_id: str
@@ -88,8 +115,7 @@ class SensorDevice(SensorDeviceBase):
     last_seen: Optional[datetime]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # AI Model schemas
 class CreditScoringRequest(BaseModel):
@@ -110,8 +136,7 @@ class CreditScore(BaseModel):
     explanation: List[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class YieldPredictionRequest(BaseModel):
     crop_type: str
@@ -132,8 +157,7 @@ class YieldPrediction(BaseModel):
     important_factors: List[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ClimateAnalysisRequest(BaseModel):
     satellite_data: Dict[str, Any]
@@ -149,8 +173,7 @@ class ClimateAnalysis(BaseModel):
     confidence: float
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Loan schemas
 class LoanBase(BaseModel):
@@ -186,8 +209,7 @@ class Loan(LoanBase):
     repaid_at: Optional[datetime]
     defaulted_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class LoanRepayment(BaseModel):
     loan_id: int
@@ -221,8 +243,7 @@ class MarketplaceListing(MarketplaceListingBase):
     images: Optional[List[str]]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Notification schemas
 class NotificationBase(BaseModel):
@@ -237,8 +258,7 @@ class Notification(NotificationBase):
     data: Optional[Dict[str, Any]]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Carbon credit schemas
 class CarbonCreditBase(BaseModel):
@@ -252,5 +272,4 @@ class CarbonCredit(CarbonCreditBase):
     user_id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
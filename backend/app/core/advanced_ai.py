@@ -4,70 +4,737 @@ Provides sophisticated ML models for agricultural analytics
 """
 
 import numpy as np
-import pandas as pd
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple, Union
+from datetime import datetime
 import logging
 import asyncio
+import copy
 from concurrent.futures import ThreadPoolExecutor
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, accuracy_score
 import joblib
 import os
-import json
+import re
+import random
+import io
+import itertools
+import operator
+import bisect
 import hashlib
+import time
+import importlib.util
 import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from PIL import Image
 
-logger = logging.getLogger(__name__)
+from .config import settings
 
-# Heavy ML libraries - optional imports
-try:
-    import xgboost as xgb
-    XGBOOST_AVAILABLE = True
-except ImportError:
-    XGBOOST_AVAILABLE = False
+if TYPE_CHECKING:
+    from tensorflow import keras
 
-try:
-    import lightgbm as lgb
-    LIGHTGBM_AVAILABLE = True
-except ImportError:
-    LIGHTGBM_AVAILABLE = False
+logger = logging.getLogger(__name__)
 
-try:
+# Heavy ML libraries - optional, imported on first use so that importing this module
+# (once per forked worker) does not pay the TensorFlow/transformers start-up cost
+XGBOOST_AVAILABLE = importlib.util.find_spec("xgboost") is not None
+LIGHTGBM_AVAILABLE = importlib.util.find_spec("lightgbm") is not None
+TENSORFLOW_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec("transformers") is not None
+ONNXRUNTIME_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
+TF2ONNX_AVAILABLE = importlib.util.find_spec("tf2onnx") is not None
+OPTIMUM_AVAILABLE = ONNXRUNTIME_AVAILABLE and importlib.util.find_spec("optimum") is not None
+ACCELERATE_AVAILABLE = importlib.util.find_spec("accelerate") is not None
+LLEAVES_AVAILABLE = importlib.util.find_spec("lleaves") is not None
+
+SENTIMENT_MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+
+# ONNX Runtime providers in order of preference; unavailable ones are skipped
+_ONNX_PROVIDERS = (
+    ("TensorrtExecutionProvider", {"trt_fp16_enable": True}),
+    ("CUDAExecutionProvider", {}),
+    ("CPUExecutionProvider", {}),
+)
+
+@lru_cache(maxsize=None)
+def _tensorflow():
+    """Import TensorFlow quietly, with one inter-op thread so workers don't oversubscribe cores"""
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
     import tensorflow as tf
-    from tensorflow import keras
-    TENSORFLOW_AVAILABLE = True
-except ImportError:
-    TENSORFLOW_AVAILABLE = False
+    try:
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+        # Grow GPU memory on demand instead of each worker reserving the whole device
+        for gpu in tf.config.list_physical_devices("GPU"):
+            tf.config.experimental.set_memory_growth(gpu, True)
+    except RuntimeError:
+        # Threading and memory growth can only be configured before the TF runtime has initialized
+        pass
+    return tf
+
+@lru_cache(maxsize=None)
+def _xgboost():
+    import xgboost
+    return xgboost
+
+@lru_cache(maxsize=None)
+def _lightgbm():
+    import lightgbm
+    return lightgbm
+
+@lru_cache(maxsize=None)
+def _random_forest():
+    from sklearn.ensemble import RandomForestRegressor
+    return RandomForestRegressor
+
+@lru_cache(maxsize=None)
+def _onnxruntime():
+    import onnxruntime
+    return onnxruntime
+
+def _onnx_session_options():
+    """Session options shared by the ONNX Runtime models: full graph optimization, few threads"""
+    ort = _onnxruntime()
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Requests already run concurrently; a few threads per inference is enough
+    options.intra_op_num_threads = min(4, os.cpu_count() or 1)
+    options.add_session_config_entry('session.intra_op.allow_spinning', '1')
+    return options
+
+@lru_cache(maxsize=None)
+def _transformers_pipeline():
+    from transformers import pipeline
+    return pipeline
 
 try:
-    from transformers import pipeline
-    TRANSFORMERS_AVAILABLE = True
+    from numba import njit
+    NUMBA_AVAILABLE = True
 except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+    NUMBA_AVAILABLE = False
 
-# Import our custom models - optional
+    def njit(*args, **kwargs):
+        """No-op stand-in so the numeric kernels run as plain Python without numba"""
+        def decorate(func):
+            return func
+        return decorate
+
+# Our custom models - optional, imported when the service is first created
 MODELS_AVAILABLE = False
-try:
-    models_path = os.path.join(os.path.dirname(__file__), '../../models')
-    if models_path not in sys.path:
-        sys.path.insert(0, models_path)
-
-    from yield_prediction_model import YieldPredictionModel
-    from climate_model import ClimateAnalysisModel
-    from sentiment_model import SentimentAnalysisModel
-    from market_price_model import MarketPriceModel
-    from credit_scoring_model import CreditScoringModel
+
+@lru_cache(maxsize=None)
+def _custom_model_classes() -> Optional[Dict[str, Any]]:
+    """Import the custom model classes once; None if they are unavailable"""
+    global MODELS_AVAILABLE
+    try:
+        models_path = os.path.join(os.path.dirname(__file__), '../../models')
+        if models_path not in sys.path:
+            sys.path.insert(0, models_path)
+
+        from yield_prediction_model import YieldPredictionModel
+        from climate_model import ClimateAnalysisModel
+        from sentiment_model import SentimentAnalysisModel
+        from market_price_model import MarketPriceModel
+        from credit_scoring_model import CreditScoringModel
+    except ImportError as e:
+        logger.warning(f"Custom models not available: {e}. Using fallback implementations.")
+        return None
+
     MODELS_AVAILABLE = True
     logger.info("Custom AI models loaded successfully")
-except ImportError as e:
-    logger.warning(f"Custom models not available: {e}. Using fallback implementations.")
+    return {
+        'yield_prediction': YieldPredictionModel,
+        'climate_analysis': ClimateAnalysisModel,
+        'sentiment': SentimentAnalysisModel,
+        'market_price': MarketPriceModel,
+        'credit_scoring': CreditScoringModel,
+    }
+
+# Per-crop parameters, built once rather than on every request
+_CROP_OPTIMAL_TEMPS: Dict[str, Tuple[float, float]] = {
+    'corn': (20.0, 30.0),
+    'wheat': (15.0, 25.0),
+    'rice': (20.0, 35.0),
+    'soybean': (20.0, 30.0)
+}
+
+_DEFAULT_OPTIMAL_TEMPS = (20.0, 30.0)
+
+_CROP_WATER_NEEDS: Dict[str, int] = {
+    'corn': 500,  # mm per season
+    'wheat': 450,
+    'rice': 1200,
+    'soybean': 400
+}
+
+_DEFAULT_WATER_NEEDS = 500
+
+_CROP_DISEASES: Dict[str, Tuple[str, ...]] = {
+    'corn': ('Blight', 'Rust', 'Leaf Spot', 'Healthy'),
+    'wheat': ('Powdery Mildew', 'Septoria', 'Yellow Rust', 'Healthy'),
+    'rice': ('Bacterial Blight', 'Blast', 'Sheath Blight', 'Healthy')
+}
+
+_DEFAULT_DISEASES = ('Unknown Disease', 'Healthy')
+
+# Label order of the crop disease CNN's 10-way softmax, shared by every crop. Trained
+# weights must be exported with this order; each crop only reads its own labels' indices.
+_CROP_DISEASE_CLASSES = (
+    'Healthy', 'Blight', 'Rust', 'Leaf Spot', 'Powdery Mildew',
+    'Septoria', 'Yellow Rust', 'Bacterial Blight', 'Blast', 'Sheath Blight',
+)
+_CROP_DISEASE_CLASS_INDICES: Dict[str, np.ndarray] = {
+    crop: np.array([_CROP_DISEASE_CLASSES.index(label) for label in labels])
+    for crop, labels in _CROP_DISEASES.items()
+}
+
+@lru_cache(maxsize=64)
+def _norm_crop(crop_type: str) -> str:
+    return crop_type.lower()
+
+# Pickled models already loaded in this process, keyed by (path, mtime)
+_PICKLED_MODELS: Dict[Tuple[str, float], Any] = {}
+
+def _load_pickled_model(path: str):
+    """joblib.load with numpy weights memory-mapped, so workers share them via the page cache
+
+    Requires the pickle to be dumped uncompressed (compress=0).
+    """
+    key = (path, os.path.getmtime(path))
+    model = _PICKLED_MODELS.get(key)
+    if model is None:
+        model = _PICKLED_MODELS[key] = joblib.load(path, mmap_mode='r')
+    return model
+
+@dataclass(frozen=True)
+class PriceHistory:
+    """Price series as parallel arrays, built once from the incoming records"""
+    prices: np.ndarray
+    dates: np.ndarray
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "PriceHistory":
+        n = len(records)
+        prices = np.empty(n, dtype=np.float64)
+        dates = np.empty(n, dtype=object)
+        for i, item in enumerate(records):
+            prices[i] = item.get('price', 0)
+            dates[i] = item.get('date')
+        return cls(prices=prices, dates=dates)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+def _is_up_to_date(path: str, source_path: str) -> bool:
+    """Whether a derived model file exists and is at least as new as the file it came from"""
+    return os.path.exists(path) and (
+        not os.path.exists(source_path) or os.path.getmtime(path) >= os.path.getmtime(source_path)
+    )
+
+def _round(value, ndigits: int) -> float:
+    """round() to a plain Python float, so numpy scalars never reach the response encoder"""
+    return round(float(value), ndigits)
+
+def _forecast_dates(days_ahead: int) -> List[str]:
+    """ISO dates for the next `days_ahead` days, computed in one datetime64 pass"""
+    today = np.datetime64(datetime.now().date())
+    return (today + np.arange(1, days_ahead + 1, dtype='timedelta64[D]')).astype(str).tolist()
+
+@lru_cache(maxsize=None)
+def _centered_index(n: int) -> np.ndarray:
+    x = np.arange(n, dtype=np.float64) - (n - 1) / 2
+    x.setflags(write=False)
+    return x
+
+def _price_stats(prices: np.ndarray) -> Tuple[float, float, float]:
+    """Least-squares slope against the index, mean and standard deviation of a price series
+
+    The deviations from the mean are computed once and shared by the closed-form slope
+    and the variance, instead of separate polyfit/mean/std passes.
+    """
+    n = prices.size
+    mean = prices.mean()
+    deviations = prices - mean
+    std = np.sqrt(np.dot(deviations, deviations) / n)
+    slope = float(np.dot(_centered_index(n), deviations) / (n * (n * n - 1) / 12)) if n > 1 else 0.0
+    return slope, mean, std
+
+# PCG64 generators for forecast noise, one per thread: a Generator holds its bit generator's
+# lock for every draw, so sharing one would serialize forecasts running on SHARED_EXECUTOR
+_rng_local = threading.local()
+
+def _thread_rng() -> np.random.Generator:
+    rng = getattr(_rng_local, 'rng', None)
+    if rng is None:
+        rng = _rng_local.rng = np.random.default_rng()
+    return rng
+
+# Scalar draws for mock results; the stdlib generator avoids numpy's per-call array overhead
+_mock_rng = random.Random()
+
+@lru_cache(maxsize=None)
+def _mock_disease_cum_weights(n_labels: int) -> Tuple[float, ...]:
+    """Cumulative draw weights: Healthy (last) gets 70%, the other labels share the rest"""
+    weights = [0.3 / (n_labels - 1)] * (n_labels - 1) + [0.7]
+    return tuple(itertools.accumulate(weights))
+
+# Numeric kernels for the climate risk calculators. They take float64 arrays and are
+# written as whole-array numpy expressions, which numba fuses into single loops
+# (cached on disk across restarts) when it is installed.
+@njit(cache=True)
+def _temperature_stress_kernel(temperatures, optimal_min, optimal_max):
+    stress_days = ((temperatures < optimal_min - 5) | (temperatures > optimal_max + 5)).sum()
+    return min(stress_days / temperatures.size, 1.0)
+
+@njit(cache=True)
+def _disease_risk_kernel(humidities, temperatures):
+    # Disease risk is higher when both humidity is high and temperature is optimal for pathogens
+    humidity_risk = np.count_nonzero(humidities > 80) / humidities.size
+    temp_risk = np.count_nonzero((temperatures >= 20) & (temperatures <= 30)) / temperatures.size
+    return min(humidity_risk * temp_risk * 2, 1.0)
+
+@njit(cache=True)
+def _total_kernel(values):
+    return values.sum()
+
+# Lending risk factors in the order _lending_risk_kernel returns them, with their weights
+_LENDING_RISK_FACTORS = ('credit_score', 'repayment_history', 'income_stability', 'loan_to_value')
+_LENDING_RISK_WEIGHTS = (0.4, 0.3, 0.2, 0.1)
+
+@njit(cache=True)
+def _lending_risk_kernel(credit_score, repayment_history, income_stability, loan_to_value):
+    # Risk scoring model (simplified): each factor in [0, 1], higher = riskier
+    credit_risk = max(0.0, (800.0 - credit_score) / 200.0)  # Higher score = lower risk
+    repayment_risk = 1.0 - repayment_history  # Better history = lower risk
+    income_risk = 1.0 - income_stability  # More stable = lower risk
+    ltv_risk = min(loan_to_value, 2.0) / 2.0  # Higher LTV = higher risk
+    factors = (credit_risk, repayment_risk, income_risk, ltv_risk)
+    risk_score = 0.0
+    for i in range(4):
+        risk_score += factors[i] * _LENDING_RISK_WEIGHTS[i]
+
+    # Risk level index (low/medium/high) and the loan ratio allowed at that level
+    if risk_score < 0.3:
+        level, max_loan_ratio = 0, 0.7
+    elif risk_score < 0.6:
+        level, max_loan_ratio = 1, 0.5
+    else:
+        level, max_loan_ratio = 2, 0.3
+
+    # Recommended interest rate: 8% base plus up to 5% risk premium
+    recommended_rate = 0.08 + risk_score * 0.05
+    return risk_score, level, max_loan_ratio, recommended_rate, factors
+
+if NUMBA_AVAILABLE:
+    # Pay JIT compilation at import rather than on the first request
+    _warmup = np.zeros(1, dtype=np.float64)
+    _temperature_stress_kernel(_warmup, 20.0, 30.0)
+    _disease_risk_kernel(_warmup, _warmup)
+    _total_kernel(_warmup)
+    _lending_risk_kernel(700.0, 0.8, 0.7, 0.5)
+
+# Borrower fields read by assess_lending_risk, fetched together in one C-level call
+_get_borrower_features = operator.itemgetter('credit_score', 'repayment_history', 'income_stability')
+
+# One thread pool for all blocking model work (loading, inference) in this process.
+# Installed as the event loop's default executor at startup, so asyncio.to_thread uses it;
+# numpy, sklearn and the ML runtimes release the GIL, so threads suffice.
+# THREAD_POOL_SIZE overrides the CPU-based default.
+SHARED_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.THREAD_POOL_SIZE or min(32, (os.cpu_count() or 1) * 2),
+    thread_name_prefix="ai-svc"
+)
+
+# Dynamic batching: concurrent requests are coalesced into one model call of up to
+# MAX_BATCH items, waiting at most MAX_DELAY_MS for the batch to fill
+MAX_BATCH = 32
+MAX_DELAY_MS = 10
+
+CROP_IMAGE_SIZE = (224, 224)
+
+# Recommendations depend only on which thresholds the inputs cross, so they are cached
+# on those outcomes and shared as immutable tuples
+@lru_cache(maxsize=None)
+def _market_recommendations(trend_direction: int, volatile: bool, price_position: int) -> Tuple[str, ...]:
+    recommendations = []
+
+    if trend_direction > 0:
+        recommendations.append("Prices are trending upward - consider holding inventory")
+    elif trend_direction < 0:
+        recommendations.append("Prices are declining - consider selling soon")
+
+    if volatile:
+        recommendations.append("High price volatility - use price hedging strategies")
+    else:
+        recommendations.append("Stable market conditions - good for planning")
+
+    if price_position > 0:
+        recommendations.append("Prices above average - monitor for potential decline")
+    elif price_position < 0:
+        recommendations.append("Prices below average - potential buying opportunity")
+
+    return tuple(recommendations)
+
+@lru_cache(maxsize=None)
+def _climate_recommendations(temp_stress: bool, drought: bool, disease: bool) -> Tuple[str, ...]:
+    recommendations = []
+
+    if temp_stress:
+        recommendations.extend([
+            "Implement heat stress management techniques",
+            "Consider shade cloth or windbreaks",
+            "Adjust irrigation timing to cooler periods"
+        ])
+
+    if drought:
+        recommendations.extend([
+            "Implement drought-resistant crop varieties",
+            "Set up supplemental irrigation systems",
+            "Apply mulch to conserve soil moisture",
+            "Monitor soil moisture regularly"
+        ])
+
+    if disease:
+        recommendations.extend([
+            "Apply preventive fungicide treatments",
+            "Improve field ventilation",
+            "Practice crop rotation",
+            "Remove crop residues after harvest"
+        ])
+
+    if not recommendations:
+        recommendations.append("Current conditions are favorable for crop growth")
+
+    return tuple(recommendations)
+
+@lru_cache(maxsize=16)
+def _sentiment_insights(overall: str, many_negative: bool, mostly_positive: bool) -> Tuple[str, ...]:
+    insights = []
+
+    if overall == "positive":
+        insights.append("Farmers are generally satisfied with current conditions")
+    elif overall == "negative":
+        insights.append("Farmers are experiencing challenges that need attention")
+
+    if many_negative:
+        insights.append("Significant portion of farmers reporting difficulties")
+
+    if mostly_positive:
+        insights.append("Strong positive sentiment indicates good farmer satisfaction")
+
+    return tuple(insights)
+
+@lru_cache(maxsize=None)
+def _staking_recommendations(lock_position: int, amount_position: int) -> Tuple[str, ...]:
+    recommendations = []
+
+    if lock_position < 0:
+        recommendations.append("Consider longer lock periods for higher rewards")
+    elif lock_position > 0:
+        recommendations.append("Long lock periods increase rewards but reduce flexibility")
+
+    if amount_position < 0:
+        recommendations.append("Larger stakes typically receive better rewards")
+    elif amount_position > 0:
+        recommendations.append("Consider diversifying across multiple staking opportunities")
+
+    recommendations.append("Monitor market conditions and consider restaking rewards")
+
+    return tuple(recommendations)
+
+@lru_cache(maxsize=16)
+def _strategy_recommendations(risk_tolerance: str, horizon_position: int) -> Tuple[str, ...]:
+    recommendations = []
+
+    if risk_tolerance == "low":
+        recommendations.append("Focus on established protocols with proven track records")
+        recommendations.append("Consider stablecoin pairs for reduced volatility")
+    elif risk_tolerance == "high":
+        recommendations.append("High-risk strategies may offer higher returns but with greater potential losses")
+        recommendations.append("Diversify across multiple high-yield opportunities")
+
+    if horizon_position < 0:
+        recommendations.append("Short time horizons favor liquid, low-risk strategies")
+    elif horizon_position > 0:
+        recommendations.append("Long time horizons allow for higher-risk, higher-reward strategies")
+
+    recommendations.append("Regularly monitor and rebalance your portfolio")
+    recommendations.append("Consider impermanent loss risks in liquidity provision")
+
+    return tuple(recommendations)
+
+@lru_cache(maxsize=16)
+def _lending_recommendations(risk_level: str, high_ltv: bool) -> Tuple[str, ...]:
+    recommendations = []
+
+    if risk_level == "high":
+        recommendations.append("High-risk borrower - consider requiring additional collateral")
+        recommendations.append("Monitor loan closely and consider early liquidation if collateral value drops")
+    elif risk_level == "low":
+        recommendations.append("Low-risk borrower - favorable lending opportunity")
+
+    if high_ltv:
+        recommendations.append("High loan-to-value ratio increases liquidation risk")
+        recommendations.append("Consider requiring additional collateral or lower loan amount")
+
+    recommendations.append("Regularly monitor collateral value and borrower repayment capacity")
+    recommendations.append("Consider diversification across multiple borrowers to reduce risk")
+
+    return tuple(recommendations)
+
+class _InferenceBatcher:
+    """Collects single-item requests on an asyncio.Queue and runs them as batches
+
+    `predict_batch` receives a list of items and returns one result per item; it runs
+    in a worker thread so the event loop keeps accepting requests while a batch is in flight.
+    """
+
+    __slots__ = ('_predict_batch', '_max_batch', '_max_delay', '_queue', '_worker', '_loop')
+
+    def __init__(self, predict_batch, max_batch: int = MAX_BATCH,
+                 max_delay_ms: float = MAX_DELAY_MS):
+        self._predict_batch = predict_batch
+        self._max_batch = max_batch
+        self._max_delay = max_delay_ms / 1000
+        self._queue = None
+        self._worker = None
+        self._loop = None
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_delay
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await asyncio.to_thread(self._predict_batch, [item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+# Yield model inputs in feature order, with the value used when a key is missing
+_YIELD_FEATURE_KEYS = (
+    'farm_size', 'soil_quality', 'rainfall', 'temperature', 'fertilizer_usage',
+    'pest_control', 'crop_variety', 'farming_experience', 'irrigation_access', 'market_distance'
+)
+_YIELD_FEATURE_DEFAULTS = np.array([5.0, 0.7, 800.0, 25.0, 1.0, 1.0, 2.0, 10.0, 1.0, 1.0])
+_YIELD_FEATURE_DEFAULTS.setflags(write=False)
+
+# Rule-based fallback yield: base + weights . factors, with fertilizer capped at 2.0
+_YIELD_FALLBACK_KEYS = ('soil_quality', 'irrigation_access', 'fertilizer_usage', 'pest_control')
+_YIELD_FALLBACK_DEFAULTS = np.array([0.7, 1.0, 1.0, 1.0])
+_YIELD_FALLBACK_WEIGHTS = np.array([2.0, 0.5, 1.0, 0.3])
+_YIELD_FALLBACK_CAPS = np.array([np.inf, np.inf, 2.0, np.inf])
+for _array in (_YIELD_FALLBACK_DEFAULTS, _YIELD_FALLBACK_WEIGHTS, _YIELD_FALLBACK_CAPS):
+    _array.setflags(write=False)
+
+# Yield-strategy protocol performance (mock data - in reality from historical data) as
+# (apy, risk, liquidity) rows; unknown protocols use the trailing default row
+_PROTOCOL_NAMES = ('uniswap', 'aave', 'compound', 'curve', 'yearn')
+_PROTOCOL_INDEX = {name: i for i, name in enumerate(_PROTOCOL_NAMES)}
+_DEFAULT_PROTOCOL_INDEX = len(_PROTOCOL_NAMES)
+_PROTOCOL_TABLE = np.array([
+    [0.15, 0.3, 0.9],
+    [0.08, 0.2, 0.8],
+    [0.10, 0.25, 0.7],
+    [0.12, 0.35, 0.6],
+    [0.18, 0.4, 0.5],
+    [0.05, 0.5, 0.3],
+])
+# (apy_weight, risk_weight) per risk tolerance; anything else is treated as medium
+_RISK_TOLERANCE_INDEX = {'low': 0, 'medium': 1, 'high': 2}
+_RISK_TOLERANCE_WEIGHTS = np.array([[0.3, 0.7], [0.5, 0.5], [0.7, 0.3]])
+for _array in (_PROTOCOL_TABLE, _RISK_TOLERANCE_WEIGHTS):
+    _array.setflags(write=False)
+
+# Recent LSTM market predictions. Polling clients send the same series over and over,
+# so a short-lived LRU keyed by a digest of the inputs skips repeated inference.
+# Entries are deep-copied in and out so callers never share the nested predictions list.
+MARKET_PREDICTION_CACHE_SIZE = 1024
+MARKET_PREDICTION_TTL = 60.0
+_market_prediction_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+def _market_prediction_key(commodity: str, location: str, prices: np.ndarray, days_ahead: int) -> bytes:
+    """Digest of everything the LSTM response depends on"""
+    digest = hashlib.blake2b(np.ascontiguousarray(prices, dtype=np.float64).tobytes(), digest_size=16)
+    digest.update(f"{commodity}\x00{location}\x00{days_ahead}".encode())
+    return digest.digest()
+
+def _cached_market_prediction(key: bytes) -> Optional[Dict[str, Any]]:
+    """Cached prediction for `key`, or None if missing or older than the TTL"""
+    entry = _market_prediction_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.monotonic() - stored_at > MARKET_PREDICTION_TTL:
+        del _market_prediction_cache[key]
+        return None
+    _market_prediction_cache.move_to_end(key)
+    return copy.deepcopy(result)
+
+def _cache_market_prediction(key: bytes, result: Dict[str, Any]) -> None:
+    _market_prediction_cache[key] = (time.monotonic(), copy.deepcopy(result))
+    _market_prediction_cache.move_to_end(key)
+    if len(_market_prediction_cache) > MARKET_PREDICTION_CACHE_SIZE:
+        _market_prediction_cache.popitem(last=False)
+
+# Pipeline results for recently scored texts. Farmer texts repeat across users, so
+# hits skip the transformer forward pass. Texts are scored from worker threads, hence
+# the threading lock rather than an asyncio one.
+SENTIMENT_CACHE_SIZE = 10_000
+_sentiment_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_sentiment_cache_lock = threading.Lock()
+
+def _sentiment_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+def _score_sentiment(analyzer, texts: List[str], **kwargs) -> List[Dict[str, Any]]:
+    """Run `analyzer` on the texts missing from the cache only, one result per text"""
+    keys = [_sentiment_key(text) for text in texts]
+    with _sentiment_cache_lock:
+        results = [_sentiment_cache.get(key) for key in keys]
+    # Score each distinct missing text once, however often it repeats in the batch
+    misses: Dict[bytes, List[int]] = {}
+    for i, result in enumerate(results):
+        if result is None:
+            misses.setdefault(keys[i], []).append(i)
+    if not misses:
+        return results
+
+    scored = analyzer([texts[positions[0]] for positions in misses.values()], **kwargs)
+    with _sentiment_cache_lock:
+        for (key, positions), result in zip(misses.items(), scored):
+            for i in positions:
+                results[i] = result
+            _sentiment_cache[key] = result
+            _sentiment_cache.move_to_end(key)
+        while len(_sentiment_cache) > SENTIMENT_CACHE_SIZE:
+            _sentiment_cache.popitem(last=False)
+    return results
+
+class _CachedSentimentPipeline:
+    """Pipeline stand-in for the custom sentiment model that scores through the shared cache"""
+
+    __slots__ = ('_pipeline',)
+
+    def __init__(self, pipeline):
+        self._pipeline = pipeline
+
+    def __call__(self, texts, **kwargs):
+        if isinstance(texts, str):
+            return _score_sentiment(self._pipeline, [texts], **kwargs)[0]
+        return _score_sentiment(self._pipeline, list(texts), **kwargs)
+
+# Prediction-market question keywords, in priority order. The lookahead pattern matches
+# at every position, so overlapping keywords are all found in a single C-level scan.
+_QUESTION_CATEGORIES = (
+    ('crop_production', ('yield', 'harvest', 'production')),
+    ('market_prices', ('price', 'market', 'commodity')),
+    ('weather_events', ('weather', 'rain', 'climate')),
+)
+_QUESTION_HORIZONS = (
+    ('long_term', ('next year', '2024', 'season')),
+    ('medium_term', ('next month', 'week')),
+)
+_QUESTION_KEYWORD_PATTERN = re.compile('(?=({}))'.format('|'.join(
+    re.escape(keyword)
+    for _, keywords in _QUESTION_CATEGORIES + _QUESTION_HORIZONS
+    for keyword in keywords
+)))
+# Each keyword sets its category's bit in the low byte or its horizon's bit in the next
+# one, earlier groups on lower bits. The lowest set bit of a byte is then the winning
+# group, and its bit_length() (0 when nothing matched) indexes the name tables.
+_QUESTION_HORIZON_SHIFT = 8
+_QUESTION_KEYWORD_BITS = {
+    keyword: 1 << (shift + i)
+    for shift, groups in ((0, _QUESTION_CATEGORIES), (_QUESTION_HORIZON_SHIFT, _QUESTION_HORIZONS))
+    for i, (_, keywords) in enumerate(groups)
+    for keyword in keywords
+}
+_QUESTION_CATEGORY_NAMES = ('agricultural',) + tuple(name for name, _ in _QUESTION_CATEGORIES)
+_QUESTION_HORIZON_NAMES = ('short_term',) + tuple(name for name, _ in _QUESTION_HORIZONS)
+
+# Level cut-offs: bisect_right against these picks the label, so a value equal to
+# a cut-off falls into the higher level just like the original `x < cut` cascades
+_RISK_THRESHOLDS = (0.3, 0.7)
+_SEVERITY_THRESHOLDS = (0.8, 0.9)
+_LEVEL_LABELS = ("low", "medium", "high")
+
+# Expensive models shared by every service instance in the process. Their locks make
+# concurrent first requests wait for one load instead of each loading its own copy.
+_SHARED_SENTIMENT_ANALYZER = None
+_SENTIMENT_LOAD_LOCK = asyncio.Lock()
+_SHARED_CROP_DISEASE_MODELS: Dict[str, Tuple[Any, Any, Any, bool]] = {}
+_CROP_DISEASE_LOAD_LOCK = asyncio.Lock()
+
+# Bits of AdvancedAIService._loaded_mask
+_CROP_DISEASE_LOADED = 1
+_MARKET_PREDICTION_LOADED = 2
+_CLIMATE_RISK_LOADED = 4
+_SENTIMENT_LOADED = 8
+# Set with _CROP_DISEASE_LOADED only when trained weights were read from models_dir
+_CROP_DISEASE_TRAINED = 16
+
+@dataclass(frozen=True)
+class _TabularModelSpec:
+    """How AdvancedAIService lazily loads one of its tree models"""
+    name: str  # model cache key, also the stem of its files in models_dir
+    label: str  # for log messages
+    attr: str  # service attribute holding the model
+    native_ext: str  # extension of the library's native model file
+    loader: str  # method loading (native_path, pickle_path)
+    factory: str  # method building an untrained model when neither file exists
+
+# Tree models behind _ensure_tabular_model_loaded, by _*_LOADED bit
+_TABULAR_MODELS = {
+    _MARKET_PREDICTION_LOADED: _TabularModelSpec(
+        'market_prediction', 'market prediction', '_market_prediction_model', '.ubj',
+        '_load_market_prediction_model', '_create_market_prediction_model',
+    ),
+    _CLIMATE_RISK_LOADED: _TabularModelSpec(
+        'climate_risk', 'climate risk', '_climate_risk_model', '.txt',
+        '_load_climate_risk_model', '_create_climate_risk_model',
+    ),
+}
 
 class AdvancedAIService:
     """Advanced AI service with multiple ML models and optimized loading"""
 
+    __slots__ = (
+        'models_dir', 'cache_client', '_loaded_mask', '_load_locks', 'model_versions',
+        '_crop_disease_model', '_crop_disease_session', '_crop_disease_interpreter',
+        '_crop_disease_interpreter_lock', '_crop_disease_batcher',
+        '_market_prediction_model', '_climate_risk_model', '_sentiment_analyzer',
+        '_yield_prediction_model', '_credit_scoring_model',
+        # Custom models, set only when they import
+        '_climate_analysis_model', '_sentiment_model', '_market_price_model', '_credit_model',
+        # Set by _create_fallback_models
+        'crop_disease_model', 'market_prediction_model', 'climate_risk_model',
+    )
+
     def __init__(self, cache_client=None):
         self.models_dir = os.path.join(os.path.dirname(__file__), '../../models')
         os.makedirs(self.models_dir, exist_ok=True)
@@ -75,18 +742,17 @@ class AdvancedAIService:
         # Cache client for model caching
         self.cache_client = cache_client
 
-        # Model loading state
-        self._models_loaded = {
-            'crop_disease': False,
-            'market_prediction': False,
-            'climate_risk': False,
-            'sentiment': False,
-            'yield_prediction': False,
-            'credit_scoring': False
-        }
+        # Model loading state, one _*_LOADED bit per lazily loaded model. Tabular models get
+        # a lock per bit so concurrent first requests wait for one load instead of each
+        # reading the file (the crop and sentiment models have process-wide locks).
+        self._loaded_mask = 0
+        self._load_locks = {bit: asyncio.Lock() for bit in _TABULAR_MODELS}
 
         # Model instances (lazy loaded)
         self._crop_disease_model = None
+        self._crop_disease_session = None  # ONNX Runtime session serving the crop disease CNN
+        self._crop_disease_interpreter = None  # FP16 TFLite fallback when ONNX Runtime is missing
+        self._crop_disease_interpreter_lock = threading.Lock()
         self._market_prediction_model = None
         self._climate_risk_model = None
         self._sentiment_analyzer = None
@@ -94,160 +760,214 @@ class AdvancedAIService:
         self._credit_scoring_model = None
 
         # Initialize custom models if available
-        if MODELS_AVAILABLE:
+        model_classes = _custom_model_classes()
+        if model_classes:
             try:
-                self._yield_prediction_model = YieldPredictionModel()
-                self._climate_analysis_model = ClimateAnalysisModel()
-                self._sentiment_model = SentimentAnalysisModel()
-                self._market_price_model = MarketPriceModel()
-                self._credit_model = CreditScoringModel()
+                self._yield_prediction_model = model_classes['yield_prediction']()
+                self._climate_analysis_model = model_classes['climate_analysis']()
+                self._sentiment_model = model_classes['sentiment']()
+                self._market_price_model = model_classes['market_price']()
+                self._credit_model = model_classes['credit_scoring']()
                 logger.info("Custom AI models initialized successfully")
             except Exception as e:
                 logger.warning(f"Failed to initialize custom models: {e}")
 
-        # Thread pool for async model loading
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        # Crop images submitted concurrently share one CNN call
+        self._crop_disease_batcher = _InferenceBatcher(self._predict_crop_disease_batch)
 
         # Model metadata for versioning
         self.model_versions = {}
 
-        # Background model preloading will be started when needed
-        # asyncio.create_task(self._preload_critical_models())
+    async def startup(self):
+        """Preload the critical models; called once from the application's startup hook
 
-    async def _preload_critical_models(self):
-        """Preload critical models in background"""
+        The loaders' locks make a request that arrives mid-preload wait for it
+        rather than starting a second load.
+        """
         try:
-            # Preload market prediction model (most frequently used)
-            await self._ensure_market_model_loaded()
-            # Preload climate risk model (used for risk assessment)
-            await self._ensure_climate_model_loaded()
+            # Market prediction (most frequently used) and climate risk (used for risk assessment)
+            await asyncio.gather(*(self._ensure_tabular_model_loaded(bit) for bit in _TABULAR_MODELS))
             logger.info("Critical AI models preloaded successfully")
         except Exception as e:
-            logger.warning(f"Background model preloading failed: {e}")
+            logger.warning(f"Model preloading failed: {e}")
+
+    async def _warmup(self, name: str, predict, *args, **kwargs):
+        """Run one dummy inference so the first real request doesn't pay lazy-init costs"""
+        try:
+            await asyncio.to_thread(predict, *args, **kwargs)
+        except Exception as e:
+            logger.debug(f"Warm-up of {name} model skipped: {e}")
+
+    async def _warmup_tabular(self, name: str, model):
+        """Warm up a tree model on one all-zero row, if it has been fitted"""
+        n_features = getattr(model, 'n_features_in_', None)
+        if n_features is None and hasattr(model, 'num_feature'):
+            n_features = model.num_feature()  # native LightGBM booster
+        if n_features:
+            await self._warmup(name, model.predict, np.zeros((1, n_features), dtype=np.float32))
 
     async def _ensure_crop_model_loaded(self):
-        """Lazy load crop disease model"""
-        if not self._models_loaded['crop_disease']:
+        """Lazy load crop disease model, shared by service instances using the same models_dir"""
+        if self._loaded_mask & _CROP_DISEASE_LOADED:
+            return
+        async with _CROP_DISEASE_LOAD_LOCK:
+            shared = _SHARED_CROP_DISEASE_MODELS.get(self.models_dir)
+            if shared is not None:
+                self._crop_disease_model, self._crop_disease_session, self._crop_disease_interpreter, trained = shared
+                self._loaded_mask |= _CROP_DISEASE_LOADED | (_CROP_DISEASE_TRAINED if trained else 0)
+                return
+            await self._load_crop_model()
+            if self._loaded_mask & _CROP_DISEASE_LOADED:
+                _SHARED_CROP_DISEASE_MODELS[self.models_dir] = (
+                    self._crop_disease_model, self._crop_disease_session, self._crop_disease_interpreter,
+                    bool(self._loaded_mask & _CROP_DISEASE_TRAINED)
+                )
+
+    async def _load_crop_model(self):
+        """Load the crop disease model from the model cache, an ONNX export or Keras
+
+        Only trained weights found in models_dir (or cached from them) set
+        _CROP_DISEASE_TRAINED; without them the untrained CNN is built but never served.
+        """
+        if not self._loaded_mask & _CROP_DISEASE_LOADED:
             try:
-                # Check cache first
+                # Check cache first; only trained models are cached
                 if self.cache_client:
-                    cached_model = await self.cache_client.get_model('crop_disease')
+                    cached_model = await self.cache_client.get_model('crop_disease_trained')
                     if cached_model:
                         self._crop_disease_model = cached_model
-                        self._models_loaded['crop_disease'] = True
+                        self._loaded_mask |= _CROP_DISEASE_LOADED | _CROP_DISEASE_TRAINED
                         return
 
-                # Load from disk
                 disease_model_path = os.path.join(self.models_dir, 'crop_disease_model.h5')
-                if os.path.exists(disease_model_path):
-                    loop = asyncio.get_event_loop()
-                    self._crop_disease_model = await loop.run_in_executor(
-                        self.executor, keras.models.load_model, disease_model_path
-                    )
-                else:
-                    self._crop_disease_model = self._create_crop_disease_model()
-
-                self._models_loaded['crop_disease'] = True
-
-                # Cache the model
-                if self.cache_client:
-                    await self.cache_client.set_model('crop_disease', self._crop_disease_model)
+                onnx_model_path = os.path.join(self.models_dir, 'crop_disease_model.onnx')
+                int8_model_path = os.path.join(self.models_dir, 'crop_disease_model.int8.onnx')
+
+                # Serve an up-to-date ONNX export directly, without importing TensorFlow
+                if ONNXRUNTIME_AVAILABLE:
+                    candidates = [int8_model_path] if settings.CROP_MODEL_INT8 else []
+                    candidates.append(onnx_model_path)
+                    for candidate in candidates:
+                        if _is_up_to_date(candidate, disease_model_path):
+                            self._crop_disease_session = await asyncio.to_thread(
+                                self._open_crop_disease_session, candidate
+                            )
+                            self._loaded_mask |= _CROP_DISEASE_TRAINED
+                            break
+
+                # Otherwise load the Keras model, kept for training, and export it for inference
+                if self._crop_disease_session is None:
+                    if os.path.exists(disease_model_path):
+                        self._crop_disease_model = await asyncio.to_thread(
+                            _tensorflow().keras.models.load_model, disease_model_path
+                        )
+                        self._loaded_mask |= _CROP_DISEASE_TRAINED
+
+                        if ONNXRUNTIME_AVAILABLE and TF2ONNX_AVAILABLE:
+                            try:
+                                self._crop_disease_session = await asyncio.to_thread(
+                                    self._build_crop_disease_session, self._crop_disease_model,
+                                    disease_model_path, onnx_model_path
+                                )
+                            except Exception as e:
+                                logger.warning(f"ONNX export of crop disease model failed: {e}")
+                    else:
+                        # No trained weights: analyze_crop_health keeps its mock result
+                        self._crop_disease_model = self._create_crop_disease_model()
+
+                if self._loaded_mask & _CROP_DISEASE_TRAINED:
+                    if self._crop_disease_session is None:
+                        try:
+                            self._crop_disease_interpreter = await asyncio.to_thread(
+                                self._build_crop_disease_interpreter, self._crop_disease_model
+                            )
+                        except Exception as e:
+                            logger.warning(f"TFLite conversion of crop disease model failed, using Keras: {e}")
+
+                    await self._warmup('crop disease', self._predict_crop_disease,
+                                       np.zeros((1, *CROP_IMAGE_SIZE, 3), dtype=np.float32))
+
+                    # Cache the model
+                    if self.cache_client and self._crop_disease_model is not None:
+                        await self.cache_client.set_model('crop_disease_trained', self._crop_disease_model)
+                self._loaded_mask |= _CROP_DISEASE_LOADED
 
                 logger.info("Crop disease model loaded")
 
             except Exception as e:
                 logger.error(f"Failed to load crop disease model: {e}")
-                self._crop_disease_model = RandomForestRegressor(n_estimators=10, random_state=42)
-
-    async def _ensure_market_model_loaded(self):
-        """Lazy load market prediction model"""
-        if not self._models_loaded['market_prediction']:
-            try:
-                # Check cache first
-                if self.cache_client:
-                    cached_model = await self.cache_client.get_model('market_prediction')
-                    if cached_model:
-                        self._market_prediction_model = cached_model
-                        self._models_loaded['market_prediction'] = True
-                        return
-
-                # Load from disk
-                market_model_path = os.path.join(self.models_dir, 'market_prediction_model.pkl')
-                if os.path.exists(market_model_path):
-                    loop = asyncio.get_event_loop()
-                    self._market_prediction_model = await loop.run_in_executor(
-                        self.executor, joblib.load, market_model_path
-                    )
-                else:
-                    self._market_prediction_model = self._create_market_prediction_model()
-
-                self._models_loaded['market_prediction'] = True
-
-                # Cache the model
-                if self.cache_client:
-                    await self.cache_client.set_model('market_prediction', self._market_prediction_model)
-
-                logger.info("Market prediction model loaded")
-
-            except Exception as e:
-                logger.error(f"Failed to load market prediction model: {e}")
-                self._market_prediction_model = RandomForestRegressor(n_estimators=10, random_state=42)
-
-    async def _ensure_climate_model_loaded(self):
-        """Lazy load climate risk model"""
-        if not self._models_loaded['climate_risk']:
-            try:
-                # Check cache first
-                if self.cache_client:
-                    cached_model = await self.cache_client.get_model('climate_risk')
-                    if cached_model:
-                        self._climate_risk_model = cached_model
-                        self._models_loaded['climate_risk'] = True
-                        return
-
-                # Load from disk
-                climate_model_path = os.path.join(self.models_dir, 'climate_risk_model.pkl')
-                if os.path.exists(climate_model_path):
-                    loop = asyncio.get_event_loop()
-                    self._climate_risk_model = await loop.run_in_executor(
-                        self.executor, joblib.load, climate_model_path
-                    )
-                else:
-                    self._climate_risk_model = self._create_climate_risk_model()
-
-                self._models_loaded['climate_risk'] = True
-
-                # Cache the model
-                if self.cache_client:
-                    await self.cache_client.set_model('climate_risk', self._climate_risk_model)
-
-                logger.info("Climate risk model loaded")
-
-            except Exception as e:
-                logger.error(f"Failed to load climate risk model: {e}")
-                self._climate_risk_model = RandomForestRegressor(n_estimators=10, random_state=42)
+                self._crop_disease_model = _random_forest()(n_estimators=10, random_state=42)
+
+    async def _ensure_tabular_model_loaded(self, bit: int):
+        """Lazy load the tree model registered for `bit` in _TABULAR_MODELS"""
+        if self._loaded_mask & bit:
+            return
+        spec = _TABULAR_MODELS[bit]
+        async with self._load_locks[bit]:
+            if not self._loaded_mask & bit:
+                try:
+                    # Check cache first
+                    if self.cache_client:
+                        cached_model = await self.cache_client.get_model(spec.name)
+                        if cached_model:
+                            setattr(self, spec.attr, cached_model)
+                            self._loaded_mask |= bit
+                            return
+
+                    # Load from disk, preferring the library's native format over a pickle
+                    pickle_path = os.path.join(self.models_dir, f'{spec.name}_model.pkl')
+                    native_path = os.path.join(self.models_dir, f'{spec.name}_model{spec.native_ext}')
+                    if os.path.exists(native_path) or os.path.exists(pickle_path):
+                        model = await asyncio.to_thread(getattr(self, spec.loader), native_path, pickle_path)
+                    else:
+                        model = getattr(self, spec.factory)()
+                    setattr(self, spec.attr, model)
+
+                    await self._warmup_tabular(spec.label, model)
+                    self._loaded_mask |= bit
+
+                    # Cache the model
+                    if self.cache_client:
+                        await self.cache_client.set_model(spec.name, model)
+
+                    logger.info(f"{spec.label.capitalize()} model loaded")
+
+                except Exception as e:
+                    logger.error(f"Failed to load {spec.label} model: {e}")
+                    setattr(self, spec.attr, _random_forest()(n_estimators=10, random_state=42))
 
     async def _ensure_sentiment_analyzer_loaded(self):
-        """Lazy load sentiment analyzer"""
-        if not self._models_loaded['sentiment']:
+        """Lazy load sentiment analyzer, shared by every service instance in the process"""
+        global _SHARED_SENTIMENT_ANALYZER
+        if self._loaded_mask & _SENTIMENT_LOADED:
+            return
+        # One coroutine loads; the others wait and reuse its pipeline
+        async with _SENTIMENT_LOAD_LOCK:
+            if _SHARED_SENTIMENT_ANALYZER is not None:
+                self._sentiment_analyzer = _SHARED_SENTIMENT_ANALYZER
+                self._loaded_mask |= _SENTIMENT_LOADED
+                return
+            await self._load_sentiment_analyzer()
+            if self._loaded_mask & _SENTIMENT_LOADED:
+                _SHARED_SENTIMENT_ANALYZER = self._sentiment_analyzer
+
+    async def _load_sentiment_analyzer(self):
+        """Load the sentiment analyzer from the model cache or by building the pipeline"""
+        if not self._loaded_mask & _SENTIMENT_LOADED:
             try:
                 # Check cache first
                 if self.cache_client:
                     cached_analyzer = await self.cache_client.get_model('sentiment_analyzer')
                     if cached_analyzer:
                         self._sentiment_analyzer = cached_analyzer
-                        self._models_loaded['sentiment'] = True
+                        self._loaded_mask |= _SENTIMENT_LOADED
                         return
 
                 # Load sentiment analyzer
-                loop = asyncio.get_event_loop()
-                self._sentiment_analyzer = await loop.run_in_executor(
-                    self.executor,
-                    lambda: pipeline("sentiment-analysis",
-                                   model="cardiffnlp/twitter-roberta-base-sentiment-latest")
-                )
+                self._sentiment_analyzer = await asyncio.to_thread(self._create_sentiment_analyzer)
 
-                self._models_loaded['sentiment'] = True
+                await self._warmup('sentiment', self._sentiment_analyzer, "warmup")
+                self._loaded_mask |= _SENTIMENT_LOADED
 
                 # Cache the analyzer
                 if self.cache_client:
@@ -259,8 +979,93 @@ class AdvancedAIService:
                 logger.warning(f"Could not load sentiment analyzer: {e}")
                 self._sentiment_analyzer = None
 
-    def _create_crop_disease_model(self) -> keras.Model:
+    def _create_sentiment_analyzer(self):
+        """Sentiment pipeline backed by an ONNX Runtime export, or a torch.compile'd model
+
+        Both paths serve INT8 dynamically quantized linear layers unless
+        SENTIMENT_MODEL_INT8 is disabled, which keeps the FP32 model for comparison.
+        """
+        pipeline = _transformers_pipeline()
+
+        if OPTIMUM_AVAILABLE:
+            try:
+                from optimum.onnxruntime import ORTModelForSequenceClassification
+                from transformers import AutoTokenizer
+
+                # Export once; later starts load the saved ONNX graph directly
+                onnx_dir = os.path.join(self.models_dir, 'sentiment_onnx')
+                if not os.path.isdir(onnx_dir):
+                    model = ORTModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_NAME, export=True)
+                    model.save_pretrained(onnx_dir)
+                file_name = 'model.onnx'
+                provider = "CPUExecutionProvider"
+                if settings.SENTIMENT_MODEL_INT8:
+                    # Integer MatMul kernels are CPU-only, so the INT8 graph stays on the CPU
+                    file_name = self._quantize_sentiment_model(onnx_dir, file_name)
+                elif "CUDAExecutionProvider" in _onnxruntime().get_available_providers():
+                    provider = "CUDAExecutionProvider"
+                model = ORTModelForSequenceClassification.from_pretrained(
+                    onnx_dir, file_name=file_name, provider=provider, session_options=_onnx_session_options()
+                )
+                tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL_NAME)
+                return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+            except Exception as e:
+                logger.warning(f"ONNX export of sentiment model failed, using PyTorch: {e}")
+
+        try:
+            import torch
+        except ImportError:
+            torch = None
+        # On a GPU, serve FP16 weights to halve the bytes read per forward pass;
+        # the INT8 dynamic quantization below only has CPU kernels
+        on_gpu = torch is not None and torch.cuda.is_available()
+
+        # With accelerate, low_cpu_mem_usage hands the mmapped safetensors weights to the model
+        # instead of copying them, so every worker on a host reads them from the shared page
+        # cache. Only CPU inference benefits; GPU workers still hold a copy per device.
+        model_kwargs = {"low_cpu_mem_usage": True} if ACCELERATE_AVAILABLE else {}
+        if on_gpu:
+            model_kwargs["torch_dtype"] = torch.float16
+        analyzer = pipeline("sentiment-analysis", model=SENTIMENT_MODEL_NAME,
+                            device=0 if on_gpu else -1, model_kwargs=model_kwargs)
+        if torch is None:
+            return analyzer
+
+        if settings.SENTIMENT_MODEL_INT8 and not on_gpu:
+            try:
+                analyzer.model = torch.quantization.quantize_dynamic(
+                    analyzer.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            except Exception as e:
+                logger.warning(f"INT8 quantization of sentiment model failed, using FP32: {e}")
+
+        eager_model = analyzer.model
+        try:
+            analyzer.model = torch.compile(eager_model, mode="reduce-overhead", dynamic=True)
+            # Compilation happens on the first call, so pay for it here rather than in a request
+            analyzer("Warm-up text for the sentiment model")
+        except Exception as e:
+            logger.warning(f"torch.compile of sentiment model failed, using eager mode: {e}")
+            analyzer.model = eager_model
+        return analyzer
+
+    def _quantize_sentiment_model(self, onnx_dir: str, file_name: str) -> str:
+        """Write an INT8 dynamically quantized copy of the ONNX export next to it, returning its file name
+
+        The transformer's weights sit almost entirely in its MatMul/Gemm projections.
+        """
+        int8_name = os.path.splitext(file_name)[0] + '.int8.onnx'
+        onnx_path = os.path.join(onnx_dir, file_name)
+        int8_path = os.path.join(onnx_dir, int8_name)
+        if not _is_up_to_date(int8_path, onnx_path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QInt8,
+                             op_types_to_quantize=['MatMul', 'Gemm'])
+        return int8_name
+
+    def _create_crop_disease_model(self) -> "keras.Model":
         """Create CNN model for crop disease detection"""
+        keras = _tensorflow().keras
         model = keras.Sequential([
             keras.layers.Conv2D(32, (3, 3), activation='relu', input_shape=(224, 224, 3)),
             keras.layers.MaxPooling2D((2, 2)),
@@ -280,10 +1085,147 @@ class AdvancedAIService:
 
         return model
 
+    def _build_crop_disease_session(self, model, keras_path: str, onnx_path: str):
+        """Export the Keras CNN to ONNX and open an inference session on it"""
+        import tf2onnx
+
+        tf = _tensorflow()
+        input_signature = (tf.TensorSpec((None, 224, 224, 3), tf.float32, name="input"),)
+        # Only trained weights loaded from disk are worth persisting next to the .h5
+        output_path = onnx_path if os.path.exists(keras_path) else None
+        model_proto, _ = tf2onnx.convert.from_keras(
+            model, input_signature=input_signature, output_path=output_path
+        )
+
+        if output_path and settings.CROP_MODEL_INT8:
+            try:
+                return self._open_crop_disease_session(self._quantize_crop_disease_model(output_path))
+            except Exception as e:
+                logger.warning(f"INT8 quantization of crop disease model failed, serving FP32: {e}")
+        return self._open_crop_disease_session(model_proto.SerializeToString())
+
+    def _quantize_crop_disease_model(self, onnx_path: str) -> str:
+        """Write an INT8 dynamically quantized copy of the ONNX export, returning its path
+
+        Only the dense layers are quantized: they hold nearly all of the weights, and
+        ONNX Runtime's CPU provider has no int8 ConvInteger kernel.
+        """
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = os.path.splitext(onnx_path)[0] + '.int8.onnx'
+        quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QInt8,
+                         op_types_to_quantize=['MatMul', 'Gemm'])
+        return int8_path
+
+    def _open_crop_disease_session(self, onnx_model):
+        """ONNX Runtime session over a model path or serialized model, on the best provider"""
+        ort = _onnxruntime()
+        available = set(ort.get_available_providers())
+        providers = [provider for provider in _ONNX_PROVIDERS if provider[0] in available]
+        return ort.InferenceSession(onnx_model, sess_options=_onnx_session_options(), providers=providers)
+
+    def _build_crop_disease_interpreter(self, model):
+        """Convert the Keras CNN to TFLite with FP16 weights, halving the bytes read per inference"""
+        tf = _tensorflow()
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+        interpreter = tf.lite.Interpreter(model_content=converter.convert())
+        interpreter.allocate_tensors()
+        return interpreter
+
+    def _predict_crop_disease(self, images: np.ndarray) -> np.ndarray:
+        """Class probabilities for a (batch, 224, 224, 3) float32 image tensor"""
+        images = np.asarray(images, dtype=np.float32)
+        if self._crop_disease_session is not None:
+            input_name = self._crop_disease_session.get_inputs()[0].name
+            return self._crop_disease_session.run(None, {input_name: images})[0]
+
+        if self._crop_disease_interpreter is not None:
+            # A TFLite interpreter holds its tensors in place, so calls are serialized
+            with self._crop_disease_interpreter_lock:
+                interpreter = self._crop_disease_interpreter
+                input_detail = interpreter.get_input_details()[0]
+                if tuple(input_detail['shape']) != images.shape:
+                    interpreter.resize_tensor_input(input_detail['index'], images.shape)
+                    interpreter.allocate_tensors()
+                interpreter.set_tensor(input_detail['index'], images)
+                interpreter.invoke()
+                return interpreter.get_tensor(interpreter.get_output_details()[0]['index'])
+
+        return self._crop_disease_model.predict(images, verbose=0)
+
+    def _predict_crop_disease_batch(self, images_data: List[bytes]) -> List[Optional[np.ndarray]]:
+        """Decode a batch of uploaded images and classify them in a single CNN call
+
+        Images that cannot be decoded get None instead of class probabilities.
+        """
+        images, decoded = [], []
+        for position, image_data in enumerate(images_data):
+            try:
+                with Image.open(io.BytesIO(image_data)) as image:
+                    pixels = image.convert('RGB').resize(CROP_IMAGE_SIZE)
+                    images.append(np.asarray(pixels, dtype=np.float32) / 255.0)
+                decoded.append(position)
+            except Exception:
+                continue
+
+        results: List[Optional[np.ndarray]] = [None] * len(images_data)
+        if images:
+            probabilities = self._predict_crop_disease(np.stack(images))
+            for position, row in zip(decoded, probabilities):
+                results[position] = row
+        return results
+
+    def _load_market_prediction_model(self, native_path: str, pickle_path: str):
+        """Load the XGBoost market model from its native file, converting a legacy pickle once"""
+        if os.path.exists(native_path):
+            model = _xgboost().XGBRegressor()
+            model.load_model(native_path)
+            return model
+
+        model = _load_pickled_model(pickle_path)
+        try:
+            model.save_model(native_path)
+        except Exception as e:
+            logger.warning(f"Could not save market model in native format: {e}")
+        return model
+
+    def _load_climate_risk_model(self, native_path: str, pickle_path: str):
+        """Load the LightGBM climate booster from its native file, converting a legacy pickle once"""
+        if os.path.exists(native_path):
+            if LLEAVES_AVAILABLE:
+                try:
+                    return self._compile_climate_risk_model(native_path)
+                except Exception as e:
+                    logger.warning(f"Could not compile climate model with lleaves, using LightGBM: {e}")
+            return _lightgbm().Booster(model_file=native_path)
+
+        model = _load_pickled_model(pickle_path)
+        try:
+            getattr(model, 'booster_', model).save_model(native_path)
+        except Exception as e:
+            logger.warning(f"Could not save climate model in native format: {e}")
+        return model
+
+    def _compile_climate_risk_model(self, native_path: str):
+        """Compile the LightGBM text model into one native predict function with lleaves
+
+        The object file is cached next to the model, so later starts skip LLVM compilation.
+        """
+        import lleaves
+
+        cache_path = os.path.splitext(native_path)[0] + '.lleaves.o'
+        if os.path.exists(cache_path) and not _is_up_to_date(cache_path, native_path):
+            os.remove(cache_path)
+        model = lleaves.Model(model_file=native_path)
+        model.compile(cache=cache_path)
+        return model
+
     def _create_market_prediction_model(self):
         """Create XGBoost model for market price prediction"""
         # Create a basic model with sample parameters
-        model = xgb.XGBRegressor(
+        model = _xgboost().XGBRegressor(
             objective='reg:squarederror',
             n_estimators=100,
             max_depth=6,
@@ -294,7 +1236,7 @@ class AdvancedAIService:
 
     def _create_climate_risk_model(self):
         """Create LightGBM model for climate risk assessment"""
-        model = lgb.LGBMRegressor(
+        model = _lightgbm().LGBMRegressor(
             objective='regression',
             num_leaves=31,
             learning_rate=0.05,
@@ -305,9 +1247,9 @@ class AdvancedAIService:
 
     def _create_fallback_models(self):
         """Create basic fallback models if advanced models fail to load"""
-        self.crop_disease_model = RandomForestRegressor(n_estimators=10, random_state=42)
-        self.market_prediction_model = RandomForestRegressor(n_estimators=10, random_state=42)
-        self.climate_risk_model = RandomForestRegressor(n_estimators=10, random_state=42)
+        self.crop_disease_model = _random_forest()(n_estimators=10, random_state=42)
+        self.market_prediction_model = _random_forest()(n_estimators=10, random_state=42)
+        self.climate_risk_model = _random_forest()(n_estimators=10, random_state=42)
         logger.info("Fallback models created")
 
     async def analyze_crop_health(self, image_data: bytes, crop_type: str,
@@ -318,19 +1260,25 @@ class AdvancedAIService:
         try:
             # Ensure model is loaded
             await self._ensure_crop_model_loaded()
-            # In a real implementation, you would preprocess the image
-            # For now, return mock analysis
-            diseases = {
-                'corn': ['Blight', 'Rust', 'Leaf Spot', 'Healthy'],
-                'wheat': ['Powdery Mildew', 'Septoria', 'Yellow Rust', 'Healthy'],
-                'rice': ['Bacterial Blight', 'Blast', 'Sheath Blight', 'Healthy']
-            }
-
-            crop_diseases = diseases.get(crop_type.lower(), ['Unknown Disease', 'Healthy'])
-
-            # Mock prediction (in production, use actual model)
-            prediction = np.random.choice(crop_diseases, p=[0.1, 0.1, 0.1, 0.7])
-            confidence = np.random.uniform(0.7, 0.95)
+            crop = _norm_crop(crop_type)
+            crop_diseases = _CROP_DISEASES.get(crop, _DEFAULT_DISEASES)
+            class_indices = _CROP_DISEASE_CLASS_INDICES.get(crop)
+
+            probabilities = None
+            if self._loaded_mask & _CROP_DISEASE_TRAINED and class_indices is not None:
+                probabilities = await self._crop_disease_batcher.submit(image_data)
+
+            if probabilities is not None:
+                scores = probabilities[class_indices]
+                best = int(np.argmax(scores))
+                prediction = crop_diseases[best]
+                confidence = float(scores[best] / max(scores.sum(), 1e-9))
+            else:
+                # Mock prediction when the image, trained weights or the crop's classes are unavailable
+                prediction = _mock_rng.choices(
+                    crop_diseases, cum_weights=_mock_disease_cum_weights(len(crop_diseases)), k=1
+                )[0]
+                confidence = _mock_rng.uniform(0.7, 0.95)
 
             recommendations = []
             if prediction != 'Healthy':
@@ -343,8 +1291,8 @@ class AdvancedAIService:
 
             return {
                 "disease": prediction,
-                "confidence": round(confidence, 3),
-                "severity": "low" if confidence < 0.8 else "medium" if confidence < 0.9 else "high",
+                "confidence": _round(confidence, 3),
+                "severity": _LEVEL_LABELS[bisect.bisect_right(_SEVERITY_THRESHOLDS, confidence)],
                 "recommendations": recommendations,
                 "preventive_measures": [
                     "Regular field monitoring",
@@ -362,11 +1310,14 @@ class AdvancedAIService:
             }
 
     async def predict_market_prices(self, commodity: str, location: str,
-                                    historical_data: List[Dict[str, Any]],
+                                    historical_data: Union[PriceHistory, List[Dict[str, Any]]],
                                     days_ahead: int = 7) -> Dict[str, Any]:
         """
         Predict market prices using custom LSTM model
         """
+        if not isinstance(historical_data, PriceHistory):
+            historical_data = PriceHistory.from_records(historical_data)
+
         try:
             if not MODELS_AVAILABLE or not hasattr(self, '_market_price_model'):
                 # Fallback to simple analysis
@@ -379,50 +1330,58 @@ class AdvancedAIService:
                 }
 
             # Extract price data
-            prices = [item.get('price', 0) for item in historical_data[-90:]]  # Last 90 days for LSTM
+            prices = historical_data.prices[-90:]  # Last 90 days for LSTM
 
             if len(prices) < 60:  # Need minimum for LSTM
                 return await self._fallback_market_prediction(commodity, location, historical_data, days_ahead)
 
+            cache_key = _market_prediction_key(commodity, location, prices, days_ahead)
+            cached = _cached_market_prediction(cache_key)
+            if cached is not None:
+                return cached
+
             # Use custom LSTM model
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                self.executor, self._market_price_model.predict, prices[-60:], days_ahead
+            result = await asyncio.to_thread(
+                self._market_price_model.predict, prices[-60:], days_ahead
             )
 
             # Format predictions
-            predictions = []
-            for i, price in enumerate(result['predicted_prices']):
-                predictions.append({
-                    "date": (datetime.now() + timedelta(days=i+1)).strftime("%Y-%m-%d"),
-                    "predicted_price": round(price, 2),
-                    "confidence": result.get('confidence', 0.75)
-                })
-
-            current_price = prices[-1]
-            avg_price = np.mean(prices)
-            volatility = np.std(prices) / avg_price
-            recent_trend = np.polyfit(range(len(prices)), prices, 1)[0]
+            confidence = result.get('confidence', 0.75)
+            predicted_prices = result['predicted_prices']
+            predictions = [
+                {
+                    "date": date,
+                    "predicted_price": _round(price, 2),
+                    "confidence": confidence
+                }
+                for date, price in zip(_forecast_dates(len(predicted_prices)), predicted_prices)
+            ]
 
-            return {
+            current_price = float(prices[-1])
+            recent_trend, avg_price, price_std = _price_stats(prices)
+            volatility = price_std / avg_price
+
+            prediction = {
                 "commodity": commodity,
                 "location": location,
-                "current_price": round(current_price, 2),
+                "current_price": _round(current_price, 2),
                 "trend": "increasing" if recent_trend > 0 else "decreasing",
-                "volatility": round(volatility, 3),
+                "volatility": _round(volatility, 3),
                 "predictions": predictions,
                 "recommendations": self._generate_market_recommendations(
                     float(recent_trend), float(volatility), float(current_price), float(avg_price)
                 ),
                 "model_used": "LSTM"
             }
+            _cache_market_prediction(cache_key, prediction)
+            return prediction
 
         except Exception as e:
             logger.error(f"Market price prediction failed: {e}")
             return await self._fallback_market_prediction(commodity, location, historical_data, days_ahead)
 
     async def _fallback_market_prediction(self, commodity: str, location: str,
-                                        historical_data: List[Dict[str, Any]],
+                                        historical_data: PriceHistory,
                                         days_ahead: int = 7) -> Dict[str, Any]:
         """Fallback market prediction using simple analysis"""
         if not historical_data:
@@ -431,7 +1390,7 @@ class AdvancedAIService:
                 "predictions": []
             }
 
-        prices = [item.get('price', 0) for item in historical_data[-30:]]
+        prices = historical_data.prices[-30:]
 
         if len(prices) < 7:
             return {
@@ -439,31 +1398,35 @@ class AdvancedAIService:
                 "predictions": []
             }
 
-        recent_trend = np.polyfit(range(len(prices)), prices, 1)[0]
-        avg_price = np.mean(prices)
-        volatility = np.std(prices) / avg_price
+        recent_trend, avg_price, price_std = _price_stats(prices)
+        volatility = price_std / avg_price
 
-        predictions = []
-        current_price = prices[-1]
+        current_price = float(prices[-1])
 
-        for i in range(1, days_ahead + 1):
-            trend_factor = recent_trend * i * 0.1
-            random_factor = np.random.normal(0, volatility * 0.1)
-            predicted_price = current_price + trend_factor + random_factor
-            predicted_price = max(predicted_price, avg_price * 0.5)
+        # Whole forecast horizon in one vectorized pass
+        days = np.arange(1, days_ahead + 1, dtype=np.float64)
+        trend_factors = recent_trend * days * 0.1
+        random_factors = _thread_rng().normal(0, volatility * 0.1, size=days_ahead)
+        predicted_prices = np.maximum(current_price + trend_factors + random_factors, avg_price * 0.5)
+        confidences = np.maximum(0.1, 1 - volatility - np.abs(trend_factors) * 0.1)
 
-            predictions.append({
-                "date": (datetime.now() + timedelta(days=i)).strftime("%Y-%m-%d"),
-                "predicted_price": round(predicted_price, 2),
-                "confidence": round(max(0.1, 1 - volatility - abs(trend_factor) * 0.1), 3)
-            })
+        predictions = [
+            {
+                "date": date,
+                "predicted_price": _round(predicted_price, 2),
+                "confidence": _round(confidence, 3)
+            }
+            for date, predicted_price, confidence in zip(
+                _forecast_dates(days_ahead), predicted_prices.tolist(), confidences.tolist()
+            )
+        ]
 
         return {
             "commodity": commodity,
             "location": location,
-            "current_price": round(current_price, 2),
+            "current_price": _round(current_price, 2),
             "trend": "increasing" if recent_trend > 0 else "decreasing",
-            "volatility": round(volatility, 3),
+            "volatility": _round(volatility, 3),
             "predictions": predictions,
             "recommendations": self._generate_market_recommendations(
                 float(recent_trend), float(volatility), float(current_price), float(avg_price)
@@ -472,26 +1435,11 @@ class AdvancedAIService:
         }
 
     def _generate_market_recommendations(self, trend: float, volatility: float,
-                                       current_price: float, avg_price: float) -> List[str]:
+                                       current_price: float, avg_price: float) -> Tuple[str, ...]:
         """Generate market recommendations based on analysis"""
-        recommendations = []
-
-        if trend > 0.5:
-            recommendations.append("Prices are trending upward - consider holding inventory")
-        elif trend < -0.5:
-            recommendations.append("Prices are declining - consider selling soon")
-
-        if volatility > 0.1:
-            recommendations.append("High price volatility - use price hedging strategies")
-        else:
-            recommendations.append("Stable market conditions - good for planning")
-
-        if current_price > avg_price * 1.1:
-            recommendations.append("Prices above average - monitor for potential decline")
-        elif current_price < avg_price * 0.9:
-            recommendations.append("Prices below average - potential buying opportunity")
-
-        return recommendations
+        trend_direction = 1 if trend > 0.5 else -1 if trend < -0.5 else 0
+        price_position = 1 if current_price > avg_price * 1.1 else -1 if current_price < avg_price * 0.9 else 0
+        return _market_recommendations(trend_direction, volatility > 0.1, price_position)
 
     async def assess_climate_risk(self, location: str, crop_type: str,
                                 weather_forecast: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -500,36 +1448,42 @@ class AdvancedAIService:
         """
         try:
             # Ensure model is loaded
-            await self._ensure_climate_model_loaded()
+            await self._ensure_tabular_model_loaded(_CLIMATE_RISK_LOADED)
             if not weather_forecast:
                 return {
                     "error": "Weather forecast data required",
                     "risk_level": "unknown"
                 }
 
-            # Extract weather parameters
-            temperatures = [day.get('temperature', 25) for day in weather_forecast]
-            humidities = [day.get('humidity', 70) for day in weather_forecast]
-            rainfalls = [day.get('rainfall', 5) for day in weather_forecast]
+            # Extract weather parameters into float64 arrays in one pass, shared by the risk kernels
+            n = len(weather_forecast)
+            temperatures = np.empty(n, dtype=np.float64)
+            humidities = np.empty(n, dtype=np.float64)
+            rainfalls = np.empty(n, dtype=np.float64)
+            for i, day in enumerate(weather_forecast):
+                temperatures[i] = day.get('temperature', 25)
+                humidities[i] = day.get('humidity', 70)
+                rainfalls[i] = day.get('rainfall', 5)
 
             # Calculate risk factors
-            temp_stress = self._calculate_temperature_stress(temperatures, crop_type)
-            drought_risk = self._calculate_drought_risk(rainfalls, crop_type)
+            crop = _norm_crop(crop_type)
+            temp_stress = self._calculate_temperature_stress(temperatures, crop)
+            drought_risk = self._calculate_drought_risk(rainfalls, crop)
             disease_risk = self._calculate_disease_risk(humidities, temperatures, crop_type)
 
             overall_risk = max(temp_stress, drought_risk, disease_risk)
 
-            risk_level = "low" if overall_risk < 0.3 else "medium" if overall_risk < 0.7 else "high"
+            risk_level = _LEVEL_LABELS[bisect.bisect_right(_RISK_THRESHOLDS, overall_risk)]
 
             return {
                 "location": location,
                 "crop_type": crop_type,
-                "overall_risk_score": round(overall_risk, 3),
+                "overall_risk_score": _round(overall_risk, 3),
                 "risk_level": risk_level,
                 "risk_factors": {
-                    "temperature_stress": round(temp_stress, 3),
-                    "drought_risk": round(drought_risk, 3),
-                    "disease_risk": round(disease_risk, 3)
+                    "temperature_stress": _round(temp_stress, 3),
+                    "drought_risk": _round(drought_risk, 3),
+                    "disease_risk": _round(disease_risk, 3)
                 },
                 "recommendations": self._generate_climate_recommendations(
                     temp_stress, drought_risk, disease_risk, crop_type
@@ -544,35 +1498,16 @@ class AdvancedAIService:
                 "message": str(e)
             }
 
-    def _calculate_temperature_stress(self, temperatures: List[float], crop_type: str) -> float:
-        """Calculate temperature stress risk"""
-        crop_optimal_temps = {
-            'corn': (20, 30),
-            'wheat': (15, 25),
-            'rice': (20, 35),
-            'soybean': (20, 30)
-        }
-
-        optimal_min, optimal_max = crop_optimal_temps.get(crop_type.lower(), (20, 30))
-
-        stress_days = 0
-        for temp in temperatures:
-            if temp < optimal_min - 5 or temp > optimal_max + 5:
-                stress_days += 1
-
-        return min(stress_days / len(temperatures), 1.0)
+    def _calculate_temperature_stress(self, temperatures: np.ndarray, crop_type: str) -> float:
+        """Calculate temperature stress risk (crop_type already lowercased)"""
+        optimal_min, optimal_max = _CROP_OPTIMAL_TEMPS.get(crop_type, _DEFAULT_OPTIMAL_TEMPS)
 
-    def _calculate_drought_risk(self, rainfalls: List[float], crop_type: str) -> float:
-        """Calculate drought risk"""
-        crop_water_needs = {
-            'corn': 500,  # mm per season
-            'wheat': 450,
-            'rice': 1200,
-            'soybean': 400
-        }
+        return _temperature_stress_kernel(temperatures, optimal_min, optimal_max)
 
-        weekly_need = crop_water_needs.get(crop_type.lower(), 500) / 12  # Rough weekly estimate
-        total_rainfall = sum(rainfalls)
+    def _calculate_drought_risk(self, rainfalls: np.ndarray, crop_type: str) -> float:
+        """Calculate drought risk (crop_type already lowercased)"""
+        weekly_need = _CROP_WATER_NEEDS.get(crop_type, _DEFAULT_WATER_NEEDS) / 12  # Rough weekly estimate
+        total_rainfall = _total_kernel(rainfalls)
 
         if total_rainfall < weekly_need * 0.5:
             return 0.8  # High risk
@@ -581,50 +1516,15 @@ class AdvancedAIService:
         else:
             return 0.2  # Low risk
 
-    def _calculate_disease_risk(self, humidities: List[float],
-                               temperatures: List[float], crop_type: str) -> float:
+    def _calculate_disease_risk(self, humidities: np.ndarray,
+                               temperatures: np.ndarray, crop_type: str) -> float:
         """Calculate disease risk based on humidity and temperature"""
-        high_humidity_days = sum(1 for h in humidities if h > 80)
-        optimal_temp_days = sum(1 for t in temperatures if 20 <= t <= 30)
-
-        humidity_risk = high_humidity_days / len(humidities)
-        temp_risk = optimal_temp_days / len(temperatures)
-
-        # Disease risk is higher when both humidity is high and temperature is optimal for pathogens
-        return min(humidity_risk * temp_risk * 2, 1.0)
+        return _disease_risk_kernel(humidities, temperatures)
 
     def _generate_climate_recommendations(self, temp_stress: float, drought_risk: float,
-                                        disease_risk: float, crop_type: str) -> List[str]:
+                                        disease_risk: float, crop_type: str) -> Tuple[str, ...]:
         """Generate climate risk mitigation recommendations"""
-        recommendations = []
-
-        if temp_stress > 0.5:
-            recommendations.extend([
-                "Implement heat stress management techniques",
-                "Consider shade cloth or windbreaks",
-                "Adjust irrigation timing to cooler periods"
-            ])
-
-        if drought_risk > 0.5:
-            recommendations.extend([
-                "Implement drought-resistant crop varieties",
-                "Set up supplemental irrigation systems",
-                "Apply mulch to conserve soil moisture",
-                "Monitor soil moisture regularly"
-            ])
-
-        if disease_risk > 0.5:
-            recommendations.extend([
-                "Apply preventive fungicide treatments",
-                "Improve field ventilation",
-                "Practice crop rotation",
-                "Remove crop residues after harvest"
-            ])
-
-        if not recommendations:
-            recommendations.append("Current conditions are favorable for crop growth")
-
-        return recommendations
+        return _climate_recommendations(temp_stress > 0.5, drought_risk > 0.5, disease_risk > 0.5)
 
     async def predict_crop_yield(self, farm_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -641,9 +1541,8 @@ class AdvancedAIService:
             features = self._extract_yield_features(farm_data)
 
             # Run prediction in thread pool
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                self.executor, self._yield_prediction_model.predict, features
+            result = await asyncio.to_thread(
+                self._yield_prediction_model.predict, features
             )
 
             return result
@@ -658,31 +1557,24 @@ class AdvancedAIService:
 
     def _extract_yield_features(self, farm_data: Dict[str, Any]) -> np.ndarray:
         """Extract features for yield prediction"""
-        features = [
-            farm_data.get('farm_size', 5.0),
-            farm_data.get('soil_quality', 0.7),
-            farm_data.get('rainfall', 800.0),
-            farm_data.get('temperature', 25.0),
-            farm_data.get('fertilizer_usage', 1.0),
-            farm_data.get('pest_control', 1.0),
-            farm_data.get('crop_variety', 2.0),
-            farm_data.get('farming_experience', 10.0),
-            farm_data.get('irrigation_access', 1.0),
-            farm_data.get('market_distance', 1.0)
-        ]
-        return np.array(features)
+        features = _YIELD_FEATURE_DEFAULTS.copy()
+        for i, key in enumerate(_YIELD_FEATURE_KEYS):
+            value = farm_data.get(key)
+            if value is not None:
+                features[i] = value
+        return features
 
     def _fallback_yield_prediction(self, farm_data: Dict[str, Any]) -> Dict[str, Any]:
         """Fallback yield prediction using simple rules"""
         base_yield = 4.0
-        modifiers = {
-            'soil_quality': farm_data.get('soil_quality', 0.7) * 2,
-            'irrigation_access': farm_data.get('irrigation_access', 1.0) * 0.5,
-            'fertilizer_usage': min(farm_data.get('fertilizer_usage', 1.0), 2.0),
-            'pest_control': farm_data.get('pest_control', 1.0) * 0.3
-        }
+        factors = _YIELD_FALLBACK_DEFAULTS.copy()
+        for i, key in enumerate(_YIELD_FALLBACK_KEYS):
+            value = farm_data.get(key)
+            if value is not None:
+                factors[i] = value
+        np.minimum(factors, _YIELD_FALLBACK_CAPS, out=factors)
 
-        predicted_yield = base_yield + sum(modifiers.values())
+        predicted_yield = base_yield + float(factors @ _YIELD_FALLBACK_WEIGHTS)
 
         return {
             "predicted_yield": round(predicted_yield, 2),
@@ -706,9 +1598,8 @@ class AdvancedAIService:
                 }
 
             # Run analysis in thread pool
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                self.executor, self._climate_analysis_model.analyze_climate_impact,
+            result = await asyncio.to_thread(
+                self._climate_analysis_model.analyze_climate_impact,
                 satellite_data, iot_sensors
             )
 
@@ -751,26 +1642,41 @@ class AdvancedAIService:
                     "fallback": True
                 }
 
-            # Prepare news articles format for the model
-            news_articles = [{"title": f"Text {i+1}", "text": text} for i, text in enumerate(text_data)]
+            # Share the service's compiled pipeline instead of loading the model a second time
+            if self._sentiment_model.sentiment_pipeline is None:
+                await self._ensure_sentiment_analyzer_loaded()
+                if self._sentiment_analyzer is not None:
+                    self._sentiment_model.sentiment_pipeline = _CachedSentimentPipeline(self._sentiment_analyzer)
 
-            # Run analysis in thread pool
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                self.executor, self._sentiment_model.analyze_market_news, news_articles
-            )
+            # Drop blank entries and bound each text once, before the batched pipeline call
+            texts = [text[:512] for text in text_data if text and not text.isspace()]
+            if not texts:
+                return {
+                    "error": "No text to analyze",
+                    "overall_sentiment": "neutral",
+                    "fallback": True
+                }
+
+            # Only the aggregate is reported, so score the bare texts rather than news articles
+            result = await asyncio.to_thread(self._sentiment_model.summarize_texts, texts)
+
+            label_counts = result["label_counts"]
+            total = len(texts)
+            positive = label_counts.get("positive", 0)
+            negative = label_counts.get("negative", 0)
+            overall = {"bullish": "positive", "bearish": "negative"}.get(result["market_outlook"], "neutral")
 
             # Convert to our expected format
             return {
                 "overall_sentiment": result["market_outlook"],
                 "confidence": round(result["aggregate_sentiment"], 3) if isinstance(result["aggregate_sentiment"], (int, float)) else 0.5,
                 "distribution": {
-                    "positive": 0.4,  # Placeholder - would need to extract from individual sentiments
-                    "negative": 0.3,
-                    "neutral": 0.3
+                    "positive": round(positive / total, 3),
+                    "negative": round(negative / total, 3),
+                    "neutral": round(label_counts.get("neutral", 0) / total, 3)
                 },
-                "sample_size": len(text_data),
-                "insights": ["Market sentiment analysis completed"]  # Would use _generate_sentiment_insights
+                "sample_size": total,
+                "insights": self._generate_sentiment_insights(overall, positive, negative, total)
             }
 
         except Exception as e:
@@ -782,24 +1688,30 @@ class AdvancedAIService:
             }
 
     def _generate_sentiment_insights(self, overall: str, positive: int,
-                                   negative: int, total: int) -> List[str]:
+                                   negative: int, total: int) -> Tuple[str, ...]:
         """Generate insights from sentiment analysis"""
-        insights = []
+        # Counts are integers, so compare against the 30% / 60% shares exactly in integers
+        return _sentiment_insights(overall, negative * 10 > total * 3, positive * 10 > total * 6)
 
-        if overall == "positive":
-            insights.append("Farmers are generally satisfied with current conditions")
-        elif overall == "negative":
-            insights.append("Farmers are experiencing challenges that need attention")
+    # New AI methods for enhanced contracts
 
-        if negative > total * 0.3:
-            insights.append("Significant portion of farmers reporting difficulties")
+    @staticmethod
+    def _compute_staking_rewards(amount: float, lock_period: int) -> Tuple[float, float, float]:
+        """Closed-form (predicted APY, estimated rewards, risk score) for a stake
 
-        if positive > total * 0.6:
-            insights.append("Strong positive sentiment indicates good farmer satisfaction")
+        Pure arithmetic, so synchronous callers can use it without going through a coroutine.
+        """
+        # Simple prediction based on amount, lock period, and historical performance
+        base_apy = 0.12  # 12% base APY
+        lock_multiplier = min(lock_period / 365, 2.0)  # Max 2x for 1 year lock
+        amount_multiplier = min(amount / 1000, 1.5)  # Max 1.5x for large stakes
 
-        return insights
+        predicted_apy = base_apy * lock_multiplier * amount_multiplier
+        estimated_rewards = amount * predicted_apy * (lock_period / 365)
 
-    # New AI methods for enhanced contracts
+        # Risk assessment: low for staking, slightly higher for long locks
+        risk_score = 0.2 if lock_period > 365 else 0.1
+        return predicted_apy, estimated_rewards, risk_score
 
     async def predict_staking_rewards(self, amount: float, lock_period: int,
                                     historical_data: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -808,24 +1720,14 @@ class AdvancedAIService:
         Analyzes historical staking data and market conditions
         """
         try:
-            # Simple prediction based on amount, lock period, and historical performance
-            base_apy = 0.12  # 12% base APY
-            lock_multiplier = min(lock_period / 365, 2.0)  # Max 2x for 1 year lock
-            amount_multiplier = min(amount / 1000, 1.5)  # Max 1.5x for large stakes
-
-            predicted_apy = base_apy * lock_multiplier * amount_multiplier
-
-            # Risk assessment
-            risk_score = 0.1  # Low risk for staking
-            if lock_period > 365:
-                risk_score += 0.1  # Slightly higher risk for long locks
+            predicted_apy, estimated_rewards, risk_score = self._compute_staking_rewards(amount, lock_period)
 
             # Confidence based on historical data
             confidence = min(len(historical_data) / 100, 1.0) if historical_data else 0.5
 
             return {
                 "predicted_apy": round(predicted_apy, 4),
-                "estimated_rewards": round(amount * predicted_apy * (lock_period / 365), 2),
+                "estimated_rewards": round(estimated_rewards, 2),
                 "risk_score": round(risk_score, 2),
                 "confidence": round(confidence, 2),
                 "recommendations": self._generate_staking_recommendations(lock_period, amount)
@@ -847,35 +1749,28 @@ class AdvancedAIService:
         Predict outcomes for prediction markets using AI
         Analyzes historical agricultural data and market trends
         """
-        try:
-            # Use sentiment analysis and historical patterns
-            await self._ensure_sentiment_analyzer_loaded()
-
-            # Analyze market question for sentiment
-            question_sentiment = self._sentiment_analyzer(market_question[:512])
-
-            # Base probabilities (equal distribution)
-            base_prob = 1.0 / len(outcomes)
-            probabilities = [base_prob] * len(outcomes)
-
-            # Adjust based on sentiment and historical data
-            if question_sentiment and question_sentiment[0]['label'] == 'LABEL_2':  # Positive
-                # Slightly favor positive outcomes
-                probabilities = [p * 1.2 for p in probabilities]
-            elif question_sentiment and question_sentiment[0]['label'] == 'LABEL_0':  # Negative
-                # Slightly favor negative outcomes
-                probabilities = [p * 0.8 for p in probabilities]
+        if not outcomes:
+            return {
+                "error": "At least one outcome is required",
+                "predicted_probabilities": {},
+                "confidence": 0.0
+            }
 
-            # Normalize probabilities
-            total = sum(probabilities)
-            probabilities = [p / total for p in probabilities]
+        try:
+            # Equal distribution. Scaling every outcome by the question's sentiment (1.2 if
+            # positive, 0.8 if negative) cancels when the probabilities are normalized, so
+            # the sentiment pass is skipped and the distribution emitted directly.
+            # Per-outcome adjustments would replace this, e.g.:
+            #   weights = [outcome_weight(outcome, question_sentiment) for outcome in outcomes]
+            #   total = sum(weights)
+            #   probabilities = {o: round(w / total, 3) for o, w in zip(outcomes, weights)}
+            probabilities = dict.fromkeys(outcomes, round(1.0 / len(outcomes), 3))
 
             # Calculate confidence based on data availability
             confidence = min(len(historical_data) / 50, 1.0) if historical_data else 0.3
 
             return {
-                "predicted_probabilities": {outcomes[i]: round(probabilities[i], 3)
-                                          for i in range(len(outcomes))},
+                "predicted_probabilities": probabilities,
                 "confidence": round(confidence, 2),
                 "market_analysis": self._analyze_market_question(market_question),
                 "risk_assessment": "medium"  # Prediction markets are inherently risky
@@ -885,8 +1780,7 @@ class AdvancedAIService:
             logger.error(f"Market outcome prediction failed: {e}")
             return {
                 "error": "Prediction failed",
-                "predicted_probabilities": {outcome: round(1.0/len(outcomes), 3)
-                                          for outcome in outcomes},
+                "predicted_probabilities": dict.fromkeys(outcomes, round(1.0 / len(outcomes), 3)),
                 "confidence": 0.0
             }
 
@@ -898,48 +1792,25 @@ class AdvancedAIService:
         Considers risk, returns, and protocol performance
         """
         try:
-            # Protocol performance scores (mock data - in reality from historical data)
-            protocol_scores = {
-                'uniswap': {'apy': 0.15, 'risk': 0.3, 'liquidity': 0.9},
-                'aave': {'apy': 0.08, 'risk': 0.2, 'liquidity': 0.8},
-                'compound': {'apy': 0.10, 'risk': 0.25, 'liquidity': 0.7},
-                'curve': {'apy': 0.12, 'risk': 0.35, 'liquidity': 0.6},
-                'yearn': {'apy': 0.18, 'risk': 0.4, 'liquidity': 0.5}
-            }
-
-            # Filter available protocols
-            available_scores = {p: protocol_scores.get(p, {'apy': 0.05, 'risk': 0.5, 'liquidity': 0.3})
-                              for p in available_protocols}
-
-            # Risk tolerance mapping
-            risk_weights = {
-                'low': {'apy_weight': 0.3, 'risk_weight': 0.7},
-                'medium': {'apy_weight': 0.5, 'risk_weight': 0.5},
-                'high': {'apy_weight': 0.7, 'risk_weight': 0.3}
-            }
+            # Gather one (apy, risk, liquidity) row per requested protocol
+            protocols = list(dict.fromkeys(available_protocols))
+            idxs = np.fromiter((_PROTOCOL_INDEX.get(p, _DEFAULT_PROTOCOL_INDEX) for p in protocols),
+                               dtype=np.intp, count=len(protocols))
+            apy, risk, liquidity = _PROTOCOL_TABLE[idxs].T
+            apy_weight, risk_weight = _RISK_TOLERANCE_WEIGHTS[_RISK_TOLERANCE_INDEX.get(risk_tolerance, 1)]
 
-            weights = risk_weights.get(risk_tolerance, risk_weights['medium'])
-
-            # Calculate optimal allocations
-            allocations = {}
-            total_score = 0
-
-            for protocol, scores in available_scores.items():
-                # Composite score: APY * weight + (1-risk) * weight + liquidity * 0.2
-                score = (scores['apy'] * weights['apy_weight'] +
-                        (1 - scores['risk']) * weights['risk_weight'] +
-                        scores['liquidity'] * 0.2)
-                allocations[protocol] = score
-                total_score += score
+            # Composite score: APY * weight + (1-risk) * weight + liquidity * 0.2
+            scores = apy * apy_weight + (1 - risk) * risk_weight + liquidity * 0.2
+            total_score = scores.sum()
 
             # Normalize to percentages
             if total_score > 0:
-                allocations = {p: round((score / total_score) * 100, 1)
-                             for p, score in allocations.items()}
+                scores = np.round(scores / total_score * 100, 1)
 
             # Calculate expected returns
-            expected_apy = sum(allocations[p] * available_scores[p]['apy'] for p in allocations.keys()) / 100
-            expected_risk = sum(allocations[p] * available_scores[p]['risk'] for p in allocations.keys()) / 100
+            expected_apy = float(scores @ apy) / 100
+            expected_risk = float(scores @ risk) / 100
+            allocations = dict(zip(protocols, scores.tolist()))
 
             return {
                 "optimal_allocations": allocations,
@@ -966,41 +1837,19 @@ class AdvancedAIService:
         Analyzes borrower creditworthiness and collateral adequacy
         """
         try:
-            # Extract borrower features
-            credit_score = borrower_data.get('credit_score', 600)
-            repayment_history = borrower_data.get('repayment_history', 0.8)
-            income_stability = borrower_data.get('income_stability', 0.7)
+            # Extract borrower features; one itemgetter call when all are present
+            try:
+                credit_score, repayment_history, income_stability = _get_borrower_features(borrower_data)
+            except KeyError:
+                credit_score = borrower_data.get('credit_score', 600)
+                repayment_history = borrower_data.get('repayment_history', 0.8)
+                income_stability = borrower_data.get('income_stability', 0.7)
             loan_to_value = loan_amount / collateral_amount if collateral_amount > 0 else 1.0
 
-            # Risk scoring model (simplified)
-            risk_factors = {
-                'credit_score': max(0, (800 - credit_score) / 200),  # Higher score = lower risk
-                'repayment_history': 1 - repayment_history,  # Better history = lower risk
-                'income_stability': 1 - income_stability,  # More stable = lower risk
-                'loan_to_value': min(loan_to_value, 2.0) / 2.0  # Higher LTV = higher risk
-            }
-
-            # Weighted risk score
-            weights = {'credit_score': 0.4, 'repayment_history': 0.3,
-                      'income_stability': 0.2, 'loan_to_value': 0.1}
-
-            risk_score = sum(risk_factors[factor] * weights[factor] for factor in risk_factors)
-
-            # Determine risk level
-            if risk_score < 0.3:
-                risk_level = "low"
-                max_loan_ratio = 0.7
-            elif risk_score < 0.6:
-                risk_level = "medium"
-                max_loan_ratio = 0.5
-            else:
-                risk_level = "high"
-                max_loan_ratio = 0.3
-
-            # Recommended interest rate
-            base_rate = 0.08  # 8%
-            risk_premium = risk_score * 0.05  # Up to 5% additional
-            recommended_rate = base_rate + risk_premium
+            risk_score, level, max_loan_ratio, recommended_rate, factors = _lending_risk_kernel(
+                float(credit_score), float(repayment_history), float(income_stability), float(loan_to_value)
+            )
+            risk_level = _LEVEL_LABELS[level]
 
             return {
                 "risk_score": round(risk_score, 3),
@@ -1008,7 +1857,7 @@ class AdvancedAIService:
                 "recommended_loan_ratio": max_loan_ratio,
                 "recommended_interest_rate": round(recommended_rate, 4),
                 "liquidation_threshold": round(max_loan_ratio * 1.2, 2),
-                "risk_factors": {k: round(v, 3) for k, v in risk_factors.items()},
+                "risk_factors": dict(zip(_LENDING_RISK_FACTORS, [round(v, 3) for v in factors])),
                 "recommendations": self._generate_lending_recommendations(risk_level, loan_to_value)
             }
 
@@ -1022,88 +1871,43 @@ class AdvancedAIService:
                 "recommended_interest_rate": 0.08
             }
 
-    def _generate_staking_recommendations(self, lock_period: int, amount: float) -> List[str]:
+    def _generate_staking_recommendations(self, lock_period: int, amount: float) -> Tuple[str, ...]:
         """Generate staking recommendations"""
-        recommendations = []
-
-        if lock_period < 30:
-            recommendations.append("Consider longer lock periods for higher rewards")
-        elif lock_period > 365:
-            recommendations.append("Long lock periods increase rewards but reduce flexibility")
-
-        if amount < 100:
-            recommendations.append("Larger stakes typically receive better rewards")
-        elif amount > 10000:
-            recommendations.append("Consider diversifying across multiple staking opportunities")
-
-        recommendations.append("Monitor market conditions and consider restaking rewards")
-
-        return recommendations
+        lock_position = -1 if lock_period < 30 else 1 if lock_period > 365 else 0
+        amount_position = -1 if amount < 100 else 1 if amount > 10000 else 0
+        return _staking_recommendations(lock_position, amount_position)
 
     def _analyze_market_question(self, question: str) -> Dict[str, Any]:
         """Analyze prediction market question"""
-        analysis = {
+        # Simple keyword analysis: one regex scan finds every keyword present
+        mask = 0
+        for keyword in _QUESTION_KEYWORD_PATTERN.findall(question.lower()):
+            mask |= _QUESTION_KEYWORD_BITS[keyword]
+        categories = mask & 0xFF
+        horizons = mask >> _QUESTION_HORIZON_SHIFT
+
+        return {
             "complexity": "medium",
-            "time_horizon": "short_term",
-            "category": "agricultural"
+            "time_horizon": _QUESTION_HORIZON_NAMES[(horizons & -horizons).bit_length()],
+            "category": _QUESTION_CATEGORY_NAMES[(categories & -categories).bit_length()]
         }
 
-        # Simple keyword analysis
-        question_lower = question.lower()
-
-        if any(word in question_lower for word in ['yield', 'harvest', 'production']):
-            analysis["category"] = "crop_production"
-        elif any(word in question_lower for word in ['price', 'market', 'commodity']):
-            analysis["category"] = "market_prices"
-        elif any(word in question_lower for word in ['weather', 'rain', 'climate']):
-            analysis["category"] = "weather_events"
-
-        if any(word in question_lower for word in ['next year', '2024', 'season']):
-            analysis["time_horizon"] = "long_term"
-        elif any(word in question_lower for word in ['next month', 'week']):
-            analysis["time_horizon"] = "medium_term"
-
-        return analysis
-
-    def _generate_strategy_recommendations(self, risk_tolerance: str, time_horizon: int) -> List[str]:
+    def _generate_strategy_recommendations(self, risk_tolerance: str, time_horizon: int) -> Tuple[str, ...]:
         """Generate yield strategy recommendations"""
-        recommendations = []
-
-        if risk_tolerance == "low":
-            recommendations.append("Focus on established protocols with proven track records")
-            recommendations.append("Consider stablecoin pairs for reduced volatility")
-        elif risk_tolerance == "high":
-            recommendations.append("High-risk strategies may offer higher returns but with greater potential losses")
-            recommendations.append("Diversify across multiple high-yield opportunities")
-
-        if time_horizon < 30:
-            recommendations.append("Short time horizons favor liquid, low-risk strategies")
-        elif time_horizon > 180:
-            recommendations.append("Long time horizons allow for higher-risk, higher-reward strategies")
-
-        recommendations.append("Regularly monitor and rebalance your portfolio")
-        recommendations.append("Consider impermanent loss risks in liquidity provision")
-
-        return recommendations
+        horizon_position = -1 if time_horizon < 30 else 1 if time_horizon > 180 else 0
+        return _strategy_recommendations(risk_tolerance, horizon_position)
 
-    def _generate_lending_recommendations(self, risk_level: str, loan_to_value: float) -> List[str]:
+    def _generate_lending_recommendations(self, risk_level: str, loan_to_value: float) -> Tuple[str, ...]:
         """Generate lending recommendations"""
-        recommendations = []
-
-        if risk_level == "high":
-            recommendations.append("High-risk borrower - consider requiring additional collateral")
-            recommendations.append("Monitor loan closely and consider early liquidation if collateral value drops")
-        elif risk_level == "low":
-            recommendations.append("Low-risk borrower - favorable lending opportunity")
-
-        if loan_to_value > 0.7:
-            recommendations.append("High loan-to-value ratio increases liquidation risk")
-            recommendations.append("Consider requiring additional collateral or lower loan amount")
-
-        recommendations.append("Regularly monitor collateral value and borrower repayment capacity")
-        recommendations.append("Consider diversification across multiple borrowers to reduce risk")
-
-        return recommendations
-
-# Global instance
-advanced_ai_service = AdvancedAIService()
\ No newline at end of file
+        return _lending_recommendations(risk_level, loan_to_value > 0.7)
+
+@lru_cache(maxsize=1)
+def get_advanced_ai_service() -> AdvancedAIService:
+    """Process-wide service instance, created on first use rather than at import"""
+    return AdvancedAIService()
+
+def __getattr__(name: str):
+    # Keeps `from .advanced_ai import advanced_ai_service` working without eager construction
+    if name == "advanced_ai_service":
+        return get_advanced_ai_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,7 +5,7 @@ Provides pagination, filtering, sorting, and response formatting
 
 from typing import Dict, List, Any, Optional, Generic, TypeVar, Union
 from fastapi import HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Query as SQLQuery
 from sqlalchemy import desc, asc
@@ -38,6 +38,19 @@ class FilterParams(BaseModel):
     date_to: Optional[datetime] = None
     category: Optional[str] = None
 
+class ORJSONFallbackResponse(ORJSONResponse):
+    """ORJSONResponse that falls back to the stdlib encoder for values orjson rejects
+
+    orjson refuses integers beyond 64 bits, such as the uint256 token amounts the
+    staking and yield endpoints read from the contracts.
+    """
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:
+            return JSONResponse.render(self, content)
+
 class APIResponse:
     """Enhanced API response utilities"""
 
@@ -47,7 +60,7 @@ class APIResponse:
         message: str = "Operation successful",
         status_code: int = 200,
         meta: Optional[Dict[str, Any]] = None
-    ) -> JSONResponse:
+    ) -> ORJSONFallbackResponse:
         """Create a standardized success response"""
         response_data = {
             "success": True,
@@ -61,7 +74,7 @@ class APIResponse:
         if meta:
             response_data["meta"] = meta
 
-        return JSONResponse(
+        return ORJSONFallbackResponse(
             content=response_data,
             status_code=status_code
         )
@@ -72,7 +85,7 @@ class APIResponse:
         status_code: int = 500,
         errors: Optional[List[Dict[str, Any]]] = None,
         details: Optional[Dict[str, Any]] = None
-    ) -> JSONResponse:
+    ) -> ORJSONFallbackResponse:
         """Create a standardized error response"""
         response_data = {
             "success": False,
@@ -86,7 +99,7 @@ class APIResponse:
         if details:
             response_data["details"] = details
 
-        return JSONResponse(
+        return ORJSONFallbackResponse(
             content=response_data,
             status_code=status_code
         )
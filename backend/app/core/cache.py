@@ -2,18 +2,56 @@ from redis import Redis
 from typing import Any, Optional
 import json
 import pickle
+import orjson
 from .config import settings
 
+# Counters backing the GraphQL dashboard_stats query
+DASHBOARD_STATS = (
+    "total_users",
+    "active_loans",
+    "total_sensor_readings",
+    "active_marketplace_listings",
+    "total_carbon_credits",
+)
+
+# INCRBY only when the key exists, so a missing counter is never re-created from zero
+_INCR_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+# Cached values are usually plain dicts/lists; numpy values and non-string keys are
+# accepted so they encode like they would through json.dumps
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def _dumps(value: Any):
+    """Encode a value for Redis, with orjson unless it needs the stdlib encoder
+
+    orjson rejects integers beyond 64 bits (e.g. token amounts in wei) and would read
+    them back as floats, so those values go through json with a leading space: still
+    valid JSON, and never produced by orjson, so _loads knows to decode them with json.
+    """
+    try:
+        return orjson.dumps(value, option=_ORJSON_OPTIONS)
+    except TypeError:
+        return " " + json.dumps(value)
+
+def _loads(value: str) -> Any:
+    return json.loads(value) if value.startswith(" ") else orjson.loads(value)
+
 class Cache:
     def __init__(self):
         self.redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        self._incr_if_exists = self.redis_client.register_script(_INCR_IF_EXISTS)
 
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         try:
             value = self.redis_client.get(key)
             if value:
-                return json.loads(value)
+                return _loads(value)
             return None
         except Exception:
             return None
@@ -21,7 +59,7 @@ class Cache:
     async def set(self, key: str, value: Any, expire: int = 3600) -> bool:
         """Set value in cache with expiration"""
         try:
-            return self.redis_client.setex(key, expire, json.dumps(value))
+            return self.redis_client.setex(key, expire, _dumps(value))
         except Exception:
             return False
 
@@ -125,6 +163,50 @@ class Cache:
         except Exception:
             return False
 
+    async def get_dashboard_stats(self) -> Optional[dict]:
+        """Get dashboard statistics from their Redis counters, or None if any is unseeded"""
+        try:
+            values = self.redis_client.mget([f"stats:{name}" for name in DASHBOARD_STATS])
+            if any(value is None for value in values):
+                return None
+            return {name: int(value) for name, value in zip(DASHBOARD_STATS, values)}
+        except Exception:
+            return None
+
+    async def seed_dashboard_stats(self, stats: dict) -> bool:
+        """Seed dashboard counters from COUNT(*) results; they reseed hourly to heal drift"""
+        try:
+            pipe = self.redis_client.pipeline()
+            for name in DASHBOARD_STATS:
+                pipe.set(f"stats:{name}", stats[name], ex=3600, nx=True)  # 1 hour
+            pipe.execute()
+            return True
+        except Exception:
+            return False
+
+    def incr_dashboard_stat(self, name: str, amount: int = 1) -> None:
+        """Adjust a seeded dashboard counter; unseeded counters are left for the next seed"""
+        try:
+            self._incr_if_exists(keys=[f"stats:{name}"], args=[amount])
+        except Exception:
+            pass
+
+    async def get_persisted_query(self, query_hash: str) -> Optional[str]:
+        """Get a GraphQL document registered via automatic persisted queries"""
+        return await self.get(f"gql:apq:{query_hash}")
+
+    async def set_persisted_query(self, query_hash: str, query: str) -> bool:
+        """Register a GraphQL document under its sha256 hash for 24 hours"""
+        return await self.set(f"gql:apq:{query_hash}", query, expire=86400)  # 24 hours
+
+    async def get_query_result(self, result_key: str) -> Optional[dict]:
+        """Get a cached GraphQL query result"""
+        return await self.get(f"gql:result:{result_key}")
+
+    async def set_query_result(self, result_key: str, data: dict) -> bool:
+        """Cache a GraphQL query result for 30 seconds"""
+        return await self.set(f"gql:result:{result_key}", data, expire=30)  # 30 seconds
+
     async def get_sensor_insights(self, device_id: str, days: int) -> Optional[dict]:
         """Get cached sensor insights"""
         key = f"sensor_insights:{device_id}:{days}"
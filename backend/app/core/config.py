@@ -1,5 +1,5 @@
 from decouple import config
-from typing import List
+from typing import Dict, List
 
 class Settings:
     # Database
@@ -29,6 +29,10 @@ class Settings:
         cast=lambda v: [s.strip() for s in v.split(",")]
     )
 
+    # Comma-separated overrides of ALLOWED_ORIGINS / ALLOWED_HOSTS, read by main.py
+    CORS_ORIGINS: str = config("CORS_ORIGINS", default="")
+    CORS_HOSTS: str = config("CORS_HOSTS", default="")
+
     # Trusted hosts
     ALLOWED_HOSTS: List[str] = config(
         "ALLOWED_HOSTS",
@@ -49,6 +53,12 @@ class Settings:
 
     # AI Models
     MODEL_CACHE_DIR: str = config("MODEL_CACHE_DIR", default="./models")
+    # Serve the crop disease CNN with INT8-quantized dense weights (ONNX Runtime only)
+    CROP_MODEL_INT8: bool = config("CROP_MODEL_INT8", default=True, cast=bool)
+    # Serve the sentiment transformer with INT8 dynamically quantized linear layers
+    SENTIMENT_MODEL_INT8: bool = config("SENTIMENT_MODEL_INT8", default=True, cast=bool)
+    # Worker threads for blocking model work; 0 sizes the pool from the CPU count
+    THREAD_POOL_SIZE: int = config("THREAD_POOL_SIZE", default=0, cast=int)
 
     # Blockchain
     BLOCKCHAIN_RPC_URL: str = config("BLOCKCHAIN_RPC_URL", default="http://localhost:8545")
@@ -131,7 +131,7 @@ class TokenManager:
                     'user_address': user_address,
                     'amount': amount,
                     'lock_period': lock_period,
-                    'start_time': asyncio.get_event_loop().time(),
+                    'start_time': asyncio.get_running_loop().time(),
                     'tx_hash': result.get('tx_hash')
                 }
 
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from decouple import config
@@ -6,15 +7,62 @@ from decouple import config
 # Database configuration
 DATABASE_URL = config("DATABASE_URL", default="sqlite:///./agricredit.db")
 
-# Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+# Async driver URL for the same database (asyncpg for PostgreSQL, aiosqlite for SQLite)
+def _to_async_url(url: str) -> str:
+    for sync_prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+ASYNC_DATABASE_URL = config("ASYNC_DATABASE_URL", default=_to_async_url(DATABASE_URL))
+
+# Compiled-SQL cache entries per engine; the GraphQL resolvers reuse a small set of
+# statement shapes, so a larger cache keeps them from being recompiled under load
+QUERY_CACHE_SIZE = config("DB_QUERY_CACHE_SIZE", default=1200, cast=int)
+
+# asyncpg keeps server-side prepared statements per connection, skipping parse/plan on reuse
+ASYNC_CONNECT_ARGS = (
+    {"prepared_statement_cache_size": config("DB_PREPARED_STATEMENT_CACHE_SIZE", default=500, cast=int)}
+    if ASYNC_DATABASE_URL.startswith("postgresql+asyncpg://")
+    else {}
 )
 
+# Create engine
+if DATABASE_URL.startswith("sqlite"):
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+    )
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, query_cache_size=QUERY_CACHE_SIZE)
+else:
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+    )
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+        query_cache_size=QUERY_CACHE_SIZE,
+        connect_args=ASYNC_CONNECT_ARGS,
+    )
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async sessions keep attributes loaded after commit so resolvers never lazy-load
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Create Base class
 Base = declarative_base()
 
@@ -24,4 +72,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
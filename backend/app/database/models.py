@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, JSON, Index
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, JSON, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .config import Base
@@ -27,6 +27,19 @@ class User(Base):
     loans = relationship("Loan", back_populates="user")
     notifications = relationship("Notification", back_populates="user")
 
+# pg_trgm backs the trigram indexes used by leading-wildcard ILIKE location filters
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+# Trigram index for GraphQL users(filter: {location}) ILIKE '%x%' searches
+Index(
+    'idx_users_location_trgm', User.location,
+    postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'},
+).ddl_if(dialect='postgresql')
+
 class SensorDevice(Base):
     __tablename__ = "sensor_devices"
 
@@ -148,6 +161,10 @@ class Loan(Base):
     user = relationship("User", back_populates="loans")
     repayments = relationship("LoanRepayment", back_populates="loan")
 
+# Composite indexes for newest-first loan listings filtered by status or borrower
+Index('idx_loans_status_created_at', Loan.status, Loan.created_at.desc())
+Index('idx_loans_user_created_at', Loan.user_id, Loan.created_at.desc())
+
 class LoanRepayment(Base):
     __tablename__ = "loan_repayments"
 
@@ -181,6 +198,19 @@ class MarketplaceListing(Base):
     images = Column(JSON)  # Array of image URLs
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
+# Trigram index for marketplace location ILIKE '%x%' searches
+Index(
+    'idx_marketplace_listings_location_trgm', MarketplaceListing.location,
+    postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'},
+).ddl_if(dialect='postgresql')
+
+# Composite indexes for status (and crop) filtered, newest-first marketplace listings
+Index('idx_marketplace_listings_status_created_at', MarketplaceListing.status, MarketplaceListing.created_at.desc())
+Index(
+    'idx_marketplace_listings_status_crop_created_at',
+    MarketplaceListing.status, MarketplaceListing.crop_type, MarketplaceListing.created_at.desc()
+)
+
 class MarketplaceEscrow(Base):
     __tablename__ = "marketplace_escrows"
 
@@ -231,6 +261,9 @@ class CarbonCredit(Base):
     verification_proof = Column(JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
+# Composite index for a user's newest-first carbon credits
+Index('idx_carbon_credits_user_created_at', CarbonCredit.user_id, CarbonCredit.created_at.desc())
+
 class GovernanceProposal(Base):
     __tablename__ = "governance_proposals"
 
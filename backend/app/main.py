@@ -2,27 +2,36 @@ from fastapi import FastAPI, Depends, HTTPException, status, BackgroundTasks, Re
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 import structlog
 import time
+import asyncio
 import json
+import csv
+import io
 import os
 import shutil
 import numpy as np
+import msgspec
+import pydantic
+import pydantic_core
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
-from .database.config import get_db, engine, Base
+from .database.config import get_db, engine, Base, AsyncSessionLocal
 from .database.models import User, SensorDevice, SensorReading, CreditScore, YieldPrediction, ClimateAnalysis, Loan, MarketplaceListing, MarketplaceEscrow, Notification, CarbonCredit
 from .core.config import settings
+from .core.api_utils import ORJSONFallbackResponse
 from .core.security import verify_password, get_password_hash, create_access_token, verify_token
 from .core.cache import get_cache
+from .core import stats_counters  # noqa: F401  (keeps dashboard counters in step with REST writes)
 from .core.email import email_service
 from .core.websocket import websocket_endpoint
 from .core.monitoring import MonitoringMiddleware, metrics_endpoint, get_health_status
@@ -39,7 +48,7 @@ from .core.tasks import (
     update_oracle_feeds_async,
     process_loan_application_async
 )
-from .core.advanced_ai import advanced_ai_service
+from .core.advanced_ai import SHARED_EXECUTOR, PriceHistory, get_advanced_ai_service
 from .core.external_apis import external_apis_service
 from .core.api_utils import (
     PaginationParams, PaginatedResponse, FilterParams,
@@ -48,7 +57,8 @@ from .core.api_utils import (
 # from .api.graphql import graphql_app  # Temporarily disabled due to GraphQL schema issues
 from .api.schemas import (
     User as UserSchema, UserCreate, UserUpdate, Token, LoginRequest,
-    SensorReading as SensorReadingSchema, SensorReadingCreate,
+    SensorReading as SensorReadingSchema, SensorReadingCreate, SensorReadingPayload,
+    sensor_reading_decoder, sensor_reading_batch_decoder,
     SensorDevice as SensorDeviceSchema, SensorDeviceCreate,
     CreditScoringRequest, CreditScore as CreditScoreSchema,
     YieldPredictionRequest, YieldPrediction as YieldPredictionSchema,
@@ -82,7 +92,7 @@ structlog.configure(
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger(),
+    wrapper_class=structlog.stdlib.BoundLogger,
     cache_logger_on_first_use=True,
 )
 
@@ -119,6 +129,9 @@ app = FastAPI(
     title="AgriCredit AI Services",
     description="Comprehensive agricultural credit and AI services platform",
     version="2.1.0",
+    # orjson serializes datetimes and numpy values natively and is several times faster;
+    # values it rejects (uint256 token amounts) fall back to the stdlib encoder
+    default_response_class=ORJSONFallbackResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     contact={
@@ -257,7 +270,7 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
     }
 )
 @auth_limiter
-async def register_user(user_data: UserCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+async def register_user(request: Request, user_data: UserCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Register a new user"""
     # Check if user already exists
     db_user = db.query(User).filter(
@@ -302,7 +315,7 @@ async def register_user(user_data: UserCreate, background_tasks: BackgroundTasks
     }
 )
 @auth_limiter
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Authenticate user and return access token"""
     user = db.query(User).filter(User.username == form_data.username).first()
     if not user or not verify_password(form_data.password, user.hashed_password):
@@ -392,14 +405,25 @@ async def get_device(
         raise HTTPException(status_code=404, detail="Device not found")
     return device
 
+# Sensor ingest bodies are decoded with msgspec; the Pydantic schema still documents them
+def _json_request_body(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {"requestBody": {"content": {"application/json": {"schema": schema}}, "required": True}}
+
+async def _decode_request(request: Request, decoder: msgspec.json.Decoder):
+    try:
+        return decoder.decode(await request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
 # Sensor data endpoints
-@app.post("/sensor-data")
+@app.post("/sensor-data", openapi_extra=_json_request_body(SensorReadingCreate.model_json_schema()))
 async def receive_sensor_data(
-    data: SensorReadingCreate,
+    request: Request,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Receive IoT sensor data"""
+    data: SensorReadingPayload = await _decode_request(request, sensor_reading_decoder)
     try:
         # Verify device exists
         device = db.query(SensorDevice).filter(SensorDevice.device_id == data.device_id).first()
@@ -413,7 +437,7 @@ async def receive_sensor_data(
         db_reading = SensorReading(
             device_id=device.id,
             timestamp=timestamp,
-            **data.dict(exclude={'device_id', 'timestamp'})
+            **data.measurements()
         )
         db.add(db_reading)
 
@@ -431,6 +455,21 @@ async def receive_sensor_data(
         logger.error("Failed to process sensor data", error=str(e), device_id=data.device_id)
         raise HTTPException(status_code=500, detail=str(e))
 
+# Measurement columns served by the sensor history endpoints and their JSON keys.
+# Selecting plain columns returns lightweight row tuples instead of one ORM instance per reading.
+_SENSOR_MEASUREMENT_COLUMNS = (
+    SensorReading.soil_moisture, SensorReading.temperature, SensorReading.humidity,
+    SensorReading.light_level, SensorReading.ph_level, SensorReading.nitrogen,
+    SensorReading.phosphorus, SensorReading.potassium, SensorReading.rainfall,
+    SensorReading.wind_speed, SensorReading.solar_radiation,
+)
+_SENSOR_MEASUREMENT_KEYS = (
+    "soilMoisture", "temperature", "humidity", "lightLevel", "phLevel", "nitrogen",
+    "phosphorus", "potassium", "rainfall", "windSpeed", "solarRadiation",
+)
+# Columns written by the CSV export, in order
+_SENSOR_EXPORT_COLUMNS = (SensorReading.timestamp, *_SENSOR_MEASUREMENT_COLUMNS)
+
 @app.get("/sensor-data/{device_id}")
 async def get_sensor_data(
     device_id: str,
@@ -456,7 +495,7 @@ async def get_sensor_data(
 
     # Get readings within time range
     cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-    readings = db.query(SensorReading).filter(
+    readings = db.query(SensorReading.timestamp, *_SENSOR_MEASUREMENT_COLUMNS).filter(
         SensorReading.device_id == device.id,
         SensorReading.timestamp >= cutoff_time
     ).order_by(SensorReading.timestamp.desc()).all()
@@ -465,20 +504,8 @@ async def get_sensor_data(
         "status": "success",
         "device_id": device_id,
         "data": [
-            {
-                "soilMoisture": r.soil_moisture,
-                "temperature": r.temperature,
-                "humidity": r.humidity,
-                "lightLevel": r.light_level,
-                "phLevel": r.ph_level,
-                "nitrogen": r.nitrogen,
-                "phosphorus": r.phosphorus,
-                "potassium": r.potassium,
-                "rainfall": r.rainfall,
-                "windSpeed": r.wind_speed,
-                "solarRadiation": r.solar_radiation,
-                "timestamp": r.timestamp.isoformat()
-            } for r in readings
+            {**dict(zip(_SENSOR_MEASUREMENT_KEYS, values)), "timestamp": timestamp.isoformat()}
+            for timestamp, *values in readings
         ]
     }
 
@@ -488,6 +515,49 @@ async def get_sensor_data(
     logger.info("Sensor data retrieved from database", device_id=device_id, hours=hours, readings_count=len(readings))
     return result
 
+@app.get("/sensor-data/{device_id}/export")
+async def export_sensor_data(
+    device_id: str,
+    hours: Optional[int] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Stream a device's sensor history as CSV without materializing it in memory"""
+    # Verify device ownership
+    device = db.query(SensorDevice).filter(
+        SensorDevice.device_id == device_id,
+        SensorDevice.owner_id == current_user.id
+    ).first()
+    if not device:
+        raise HTTPException(status_code=404, detail="Device not found")
+
+    query = select(*_SENSOR_EXPORT_COLUMNS).where(SensorReading.device_id == device.id)
+    if hours is not None:
+        query = query.where(SensorReading.timestamp >= datetime.utcnow() - timedelta(hours=hours))
+    query = query.order_by(SensorReading.timestamp).execution_options(yield_per=1000)
+
+    async def rows():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([column.key for column in _SENSOR_EXPORT_COLUMNS])
+        yield buffer.getvalue()
+
+        # Server-side cursor: peak memory is one 1000-row partition, not the full history
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(query)
+            async for partition in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(partition)
+                yield buffer.getvalue()
+
+    logger.info("Sensor data export started", device_id=device_id, hours=hours)
+    return StreamingResponse(
+        rows(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{device_id}-sensor-data.csv"'}
+    )
+
 @app.get("/sensor-data/{device_id}/latest")
 async def get_latest_sensor_data(
     device_id: str,
@@ -843,6 +913,7 @@ def validate_text_input(text: str, max_length: int = 1000):
     }
 )
 async def analyze_crop_health(
+    request: Request,
     file: UploadFile = File(...),
     crop_type: str = Form(...),
     location: str = Form(...),
@@ -868,7 +939,7 @@ async def analyze_crop_health(
         image_data = await file.read()
 
         # Analyze crop health
-        result = await advanced_ai_service.analyze_crop_health(image_data, crop_type, location)
+        result = await get_advanced_ai_service().analyze_crop_health(image_data, crop_type, location)
 
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
@@ -894,6 +965,7 @@ async def analyze_crop_health(
     }
 )
 async def predict_market_prices(
+    request: Request,
     commodity: str,
     location: str,
     historical_data: List[Dict[str, Any]],
@@ -925,8 +997,8 @@ async def predict_market_prices(
         valid_commodities = ['corn', 'wheat', 'rice', 'soybean', 'maize', 'barley', 'oats', 'coffee', 'cocoa']
         if commodity.lower() not in valid_commodities:
             raise HTTPException(status_code=400, detail=f"Invalid commodity. Valid types: {', '.join(valid_commodities)}")
-        result = await advanced_ai_service.predict_market_prices(
-            commodity, location, historical_data, days_ahead
+        result = await get_advanced_ai_service().predict_market_prices(
+            commodity, location, PriceHistory.from_records(historical_data), days_ahead
         )
 
         if "error" in result:
@@ -953,6 +1025,7 @@ async def predict_market_prices(
     }
 )
 async def assess_climate_risk(
+    request: Request,
     location: str,
     crop_type: str,
     weather_forecast: List[Dict[str, Any]],
@@ -960,7 +1033,7 @@ async def assess_climate_risk(
 ):
     """Advanced climate risk assessment"""
     try:
-        result = await advanced_ai_service.assess_climate_risk(
+        result = await get_advanced_ai_service().assess_climate_risk(
             location, crop_type, weather_forecast
         )
 
@@ -988,6 +1061,7 @@ async def assess_climate_risk(
     }
 )
 async def analyze_farmer_sentiment(
+    request: Request,
     text_data: List[str],
     current_user: User = Depends(get_current_active_user)
 ):
@@ -1005,7 +1079,7 @@ async def analyze_farmer_sentiment(
             if not isinstance(text, str):
                 raise HTTPException(status_code=400, detail=f"Text data at index {i} must be a string")
             validate_text_input(text, max_length=1000)
-        result = await advanced_ai_service.analyze_farmer_sentiment(text_data)
+        result = await get_advanced_ai_service().analyze_farmer_sentiment(text_data)
 
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
@@ -1034,7 +1108,7 @@ async def analyze_farmer_sentiment(
                 if not isinstance(data, dict):
                     raise HTTPException(status_code=400, detail=f"Market data at index {i} must be a dictionary")
 
-            result = await advanced_ai_service.analyze_market_sentiment(market_data)
+            result = await get_advanced_ai_service().analyze_market_sentiment(market_data)
 
             if "error" in result:
                 raise HTTPException(status_code=500, detail=result["error"])
@@ -1076,7 +1150,7 @@ async def analyze_farmer_sentiment(
                     detail=f"Unsupported crop type. Supported: {', '.join(supported_crops)}"
                 )
 
-            result = await advanced_ai_service.analyze_crop_health(image_data, crop_type, location)
+            result = await get_advanced_ai_service().analyze_crop_health(image_data, crop_type, location)
 
             if "error" in result:
                 raise HTTPException(status_code=500, detail=result["error"])
@@ -1311,14 +1385,16 @@ async def mark_notification_read(
 @app.post(
     "/iot/process-sensor-batch",
     summary="Process batch IoT sensor data",
-    description="Process multiple sensor readings and trigger AI analysis, alerts, and oracle updates"
+    description="Process multiple sensor readings and trigger AI analysis, alerts, and oracle updates",
+    openapi_extra=_json_request_body({"type": "array", "items": SensorReadingCreate.model_json_schema()})
 )
 async def process_sensor_batch(
-    sensor_data: List[SensorReadingCreate],
+    request: Request,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Process batch IoT sensor data with enhanced analytics"""
+    sensor_data: List[SensorReadingPayload] = await _decode_request(request, sensor_reading_batch_decoder)
     try:
         processed_readings = []
         alerts = []
@@ -1336,7 +1412,7 @@ async def process_sensor_batch(
             db_reading = SensorReading(
                 device_id=device.id,
                 timestamp=timestamp,
-                **reading.dict(exclude={'device_id', 'timestamp'})
+                **reading.measurements()
             )
             db.add(db_reading)
             processed_readings.append(db_reading)
@@ -1873,7 +1949,7 @@ async def simple_health_check():
     }
 
 # Background tasks for enhanced processing
-async def check_sensor_anomalies(reading: SensorReadingCreate, device: SensorDevice, db: Session) -> Optional[Dict[str, Any]]:
+async def check_sensor_anomalies(reading: SensorReadingPayload, device: SensorDevice, db: Session) -> Optional[Dict[str, Any]]:
     """Check for sensor anomalies and generate alerts"""
     try:
         # Get recent readings for comparison
@@ -2240,7 +2316,7 @@ async def stake_tokens(
     """Stake tokens for rewards with AI predictions"""
     try:
         # Get AI predictions for staking rewards
-        ai_prediction = await advanced_ai_service.predict_staking_rewards(
+        ai_prediction = await get_advanced_ai_service().predict_staking_rewards(
             amount, lock_period, []  # TODO: Add historical data from DB
         )
 
@@ -2309,7 +2385,7 @@ async def create_prediction_market(
     """Create prediction market with AI analysis"""
     try:
         # Get AI predictions for market outcomes
-        ai_analysis = await advanced_ai_service.predict_market_outcomes(
+        ai_analysis = await get_advanced_ai_service().predict_market_outcomes(
             question, outcomes, []  # TODO: Add historical market data
         )
 
@@ -2398,7 +2474,7 @@ async def borrow_tokens(
         }
 
         # AI risk assessment
-        risk_assessment = await advanced_ai_service.assess_lending_risk(
+        risk_assessment = await get_advanced_ai_service().assess_lending_risk(
             borrower_data, amount, collateral_amount
         )
 
@@ -2461,7 +2537,7 @@ async def create_yield_strategy(
     """Create yield aggregation strategy with AI optimization"""
     try:
         # Get AI optimization for the strategy
-        ai_optimization = await advanced_ai_service.optimize_yield_strategy(
+        ai_optimization = await get_advanced_ai_service().optimize_yield_strategy(
             protocols, risk_tolerance, 1000, time_horizon  # Default investment amount
         )
 
@@ -4462,7 +4538,18 @@ async def get_copernicus_data(location: str, dataset: str = "NDVI"):
 @app.on_event("startup")
 async def startup_event():
     """Application startup tasks"""
-    logger.info("Starting AgriCredit backend")
+    # Schemas are validated by the compiled pydantic-core engine; log versions to catch v1 fallbacks
+    logger.info(
+        "Starting AgriCredit backend",
+        pydantic_version=pydantic.VERSION,
+        pydantic_core_version=pydantic_core.__version__
+    )
+
+    # Blocking AI work goes through asyncio.to_thread; run it on the shared pool
+    asyncio.get_running_loop().set_default_executor(SHARED_EXECUTOR)
+
+    # Load the critical AI models before serving, so the first requests don't pay for it
+    await get_advanced_ai_service().startup()
 
     # Start blockchain event listeners
     try:
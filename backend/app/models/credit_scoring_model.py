@@ -4,16 +4,9 @@ Uses machine learning to assess farmer creditworthiness
 """
 
 import numpy as np
-import pandas as pd
 import joblib
 import os
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
-import xgboost as xgb
-import lightgbm as lgb
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any
 import logging
 
 logger = logging.getLogger(__name__)
@@ -39,8 +32,9 @@ class CreditScoringModel:
         """Load existing model or train new one"""
         try:
             if os.path.exists(self.model_path) and os.path.exists(self.scaler_path):
-                self.model = joblib.load(self.model_path)
-                self.scaler = joblib.load(self.scaler_path)
+                # Memory-map the numpy weights instead of copying them into each worker
+                self.model = joblib.load(self.model_path, mmap_mode='r')
+                self.scaler = joblib.load(self.scaler_path, mmap_mode='r')
                 logger.info("Loaded existing credit scoring model")
             else:
                 self._train_model()
@@ -50,6 +44,13 @@ class CreditScoringModel:
 
     def _train_model(self):
         """Train the credit scoring model with synthetic data"""
+        # Training-only dependencies, imported here so loading a saved model skips them
+        import pandas as pd
+        import xgboost as xgb
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import accuracy_score
+
         # Generate synthetic training data
         np.random.seed(42)
         n_samples = 10000
@@ -124,9 +125,9 @@ class CreditScoringModel:
 
         logger.info(f"Credit scoring model trained with accuracy: {accuracy:.3f}")
 
-        # Save model
-        joblib.dump(self.model, self.model_path)
-        joblib.dump(self.scaler, self.scaler_path)
+        # Save model uncompressed so it can be memory-mapped on load
+        joblib.dump(self.model, self.model_path, compress=0)
+        joblib.dump(self.scaler, self.scaler_path, compress=0)
 
     def predict(self, features: List[float]) -> Dict[str, Any]:
         """
@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration for the AgriCredit API
+Runs uvicorn workers forked from a master that has already imported the app
+"""
+
+import gc
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+# Import the app once in the master; workers share those pages copy-on-write instead
+# of each holding a private copy. Only libraries main.py imports at module load come
+# along: the AI service imports its ML libraries and loads its models lazily, so those
+# still load in each worker (TensorFlow and the service's thread pool do not survive a fork).
+preload_app = True
+
+
+def when_ready(server):
+    # Move everything allocated so far out of the GC's reach, so collections in the
+    # workers don't write to (and thereby un-share) the preloaded objects
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # main.py runs create_all at import, so the master already holds pooled connections.
+    # Drop them from the worker's pools without closing the master's sockets.
+    from app.database.config import engine, async_engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
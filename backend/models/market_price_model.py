@@ -111,5 +111,4 @@ if __name__ == "__main__":
     # Predict
     recent = prices[-60:]
     prediction = model.predict(recent, days_ahead=7)
-    print(f"Price prediction: {prediction}")</content>
-</xai:function_call
\ No newline at end of file
+    print(f"Price prediction: {prediction}")
@@ -1,5 +1,13 @@
+from collections import Counter
+
 from transformers import pipeline
-import numpy as np
+
+# The roberta checkpoint emits negative/neutral/positive; older exports of it use the
+# generic LABEL_n names. Results are keyed by the canonical names so label counts match.
+_CANONICAL_LABELS = {'LABEL_0': 'negative', 'LABEL_1': 'neutral', 'LABEL_2': 'positive'}
+
+# Sign of the sentiment score for each canonical label
+_LABEL_SIGNS = {'negative': -1, 'neutral': 0, 'positive': 1}
 
 class SentimentAnalysisModel:
     """Sentiment analysis for market news and social media"""
@@ -15,44 +23,70 @@ class SentimentAnalysisModel:
 
     def analyze_text(self, text):
         """Analyze sentiment of text"""
+        return self.analyze_texts([text])[0]
+
+    def analyze_texts(self, texts, batch_size=32):
+        """Analyze sentiment of several texts in batched pipeline calls"""
         if self.sentiment_pipeline is None:
             self.load_model()
 
-        result = self.sentiment_pipeline(text)[0]
+        # Batch texts of similar length together so each batch pads to a near-equal
+        # length, then scatter the results back to the caller's order
+        texts = list(texts)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
 
+        # Inputs beyond the model's 512-token window are truncated by the tokenizer
+        results = self.sentiment_pipeline([texts[i] for i in order], batch_size=batch_size,
+                                          truncation=True, max_length=512)
+        sentiments = [None] * len(texts)
+        for i, result in zip(order, results):
+            sentiments[i] = self._to_sentiment(result)
+        return sentiments
+
+    @staticmethod
+    def _to_sentiment(result):
         # Map to our scale
-        label = result['label']
+        label = _CANONICAL_LABELS.get(result['label'], result['label'].lower())
         confidence = result['score']
-
-        if label == 'LABEL_2':  # Positive
-            sentiment_score = confidence
-        elif label == 'LABEL_0':  # Negative
-            sentiment_score = -confidence
-        else:  # Neutral
-            sentiment_score = 0
+        sentiment_score = _LABEL_SIGNS.get(label, 0) * confidence
 
         return {
             "sentiment_score": sentiment_score,
-            "label": "positive" if sentiment_score > 0.1 else "negative" if sentiment_score < -0.1 else "neutral",
+            "label": label if label in _LABEL_SIGNS else "neutral",
             "confidence": confidence
         }
 
     def analyze_market_news(self, news_articles):
         """Analyze sentiment of multiple news articles"""
-        sentiments = []
-        for article in news_articles:
-            sentiment = self.analyze_text(article['text'])
-            sentiments.append({
+        texts = [article['text'] for article in news_articles]
+        scored = self.analyze_texts(texts)
+        sentiments = [
+            {
                 "title": article['title'],
                 "sentiment": sentiment,
                 "date": article.get('date', 'unknown')
-            })
+            }
+            for article, sentiment in zip(news_articles, scored)
+        ]
+
+        return {"individual_sentiments": sentiments, **self._aggregate(scored)}
+
+    def summarize_texts(self, texts):
+        """Aggregate sentiment of plain texts, without per-article records"""
+        return self._aggregate(self.analyze_texts(texts))
 
-        # Aggregate sentiment
-        avg_sentiment = np.mean([s['sentiment']['sentiment_score'] for s in sentiments])
+    @staticmethod
+    def _aggregate(sentiments):
+        # Aggregate sentiment and label counts in a single pass
+        label_counts = Counter()
+        score_sum = 0.0
+        for sentiment in sentiments:
+            label_counts[sentiment['label']] += 1
+            score_sum += sentiment['sentiment_score']
+        avg_sentiment = score_sum / len(sentiments) if sentiments else 0.0
 
         return {
-            "individual_sentiments": sentiments,
+            "label_counts": dict(label_counts),
             "aggregate_sentiment": avg_sentiment,
             "market_outlook": "bullish" if avg_sentiment > 0.1 else "bearish" if avg_sentiment < -0.1 else "neutral"
         }
@@ -70,5 +104,4 @@ if __name__ == "__main__":
         {"title": "Market prices stable", "text": "Commodity prices remain stable this week."}
     ]
     market_sentiment = model.analyze_market_news(news)
-    print(f"Market sentiment: {market_sentiment}")</content>
-</xai:function_call
\ No newline at end of file
+    print(f"Market sentiment: {market_sentiment}")
@@ -2,7 +2,9 @@ import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi.testclient import TestClient
 from app.main import app
-from app.core.advanced_ai import AdvancedAIService, advanced_ai_service
+from app.core.advanced_ai import (
+    AdvancedAIService, advanced_ai_service, _cache_market_prediction, _cached_market_prediction
+)
 from app.database.models import User
 from app.core.security import get_password_hash
 import io
@@ -214,6 +216,26 @@ class TestAdvancedAIService:
             assert 'predicted_price' in prediction
             assert 'confidence_interval' in prediction
 
+    def test_market_prediction_cache_returns_copies(self):
+        """Test that cached market predictions are not shared between callers"""
+        key = b'test-market-prediction'
+        prediction = {'predictions': [{'predicted_price': 1.0}]}
+        _cache_market_prediction(key, prediction)
+        prediction['predictions'].append({'predicted_price': 3.0})
+
+        first = _cached_market_prediction(key)
+        first['predictions'][0]['predicted_price'] = 2.0
+
+        assert _cached_market_prediction(key) == {'predictions': [{'predicted_price': 1.0}]}
+
+    @pytest.mark.asyncio
+    async def test_predict_market_outcomes_without_outcomes(self, ai_service):
+        """Test that a market with no outcomes returns an error instead of raising"""
+        result = await ai_service.predict_market_outcomes('Will maize prices rise?', [], [])
+
+        assert result['error'] == 'At least one outcome is required'
+        assert result['predicted_probabilities'] == {}
+
 
 class TestAdvancedAIAPI:
     """Test advanced AI API endpoints"""
@@ -253,7 +275,7 @@ class TestAdvancedAIAPI:
         response = client.post("/ai/sentiment-analysis")
         assert response.status_code == 401
 
-    @patch('app.core.advanced_ai.advanced_ai_service.analyze_crop_health')
+    @patch('app.core.advanced_ai.AdvancedAIService.analyze_crop_health')
     def test_crop_disease_detection_success(self, mock_analyze, client, test_user):
         """Test successful crop disease detection"""
         # Mock the AI service response
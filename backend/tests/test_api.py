@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -6,9 +7,10 @@ from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.database.config import Base, get_db
-from app.database.models import User
+from app.database.models import User, SensorDevice, SensorReading
 from app.core.security import get_password_hash
 from app.core.config import settings
+from app.core.api_utils import ORJSONFallbackResponse
 
 # Test database setup
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -31,7 +33,8 @@ def override_get_db():
 
 app.dependency_overrides[get_db] = override_get_db
 
-client = TestClient(app)
+# TrustedHostMiddleware only admits settings.ALLOWED_HOSTS
+client = TestClient(app, base_url="http://localhost")
 
 @pytest.fixture(scope="function")
 def test_db():
@@ -213,6 +216,57 @@ class TestSensorManagement:
         assert len(devices) >= 1
         assert any(d["device_id"] == "TEST002" for d in devices)
 
+    def test_receive_sensor_data_coerces_values(self, test_user, test_db):
+        """Test that sensor ingest accepts numeric strings and epoch timestamps"""
+        test_db.add(SensorDevice(device_id="TEST003", owner_id=test_user.id))
+        test_db.commit()
+
+        reading = {
+            "device_id": "TEST003",
+            "soil_moisture": "1.5",
+            "temperature": 24.0,
+            "humidity": 60.0,
+            "light_level": 800.0,
+            "timestamp": 1700000000
+        }
+        response = client.post("/sensor-data", json=reading)
+        assert response.status_code == 200
+        assert response.json()["status"] == "success"
+
+        stored = test_db.query(SensorReading).one()
+        assert stored.soil_moisture == 1.5
+        assert stored.timestamp.replace(tzinfo=None) == datetime(2023, 11, 14, 22, 13, 20)
+
+    def test_receive_sensor_data_rejects_invalid_body(self):
+        """Test that malformed sensor readings are rejected"""
+        response = client.post("/sensor-data", json={"device_id": "TEST003", "soil_moisture": "wet"})
+        assert response.status_code == 422
+
+    def test_process_sensor_batch_coerces_values(self, test_user, test_db):
+        """Test that batch ingest accepts numeric strings and epoch timestamps"""
+        test_db.add(SensorDevice(device_id="TEST004", owner_id=test_user.id))
+        test_db.commit()
+
+        readings = [
+            {
+                "device_id": "TEST004",
+                "soil_moisture": "30.5",
+                "temperature": "22",
+                "humidity": 55.0,
+                "light_level": 700.0,
+                "timestamp": 1700000000 + i * 60
+            }
+            for i in range(3)
+        ]
+        readings.append({**readings[0], "device_id": "UNKNOWN"})
+        response = client.post("/iot/process-sensor-batch", json=readings)
+        assert response.status_code == 200
+        assert response.json()["processed_readings"] == 3
+
+        stored = test_db.query(SensorReading).all()
+        assert len(stored) == 3
+        assert all(r.soil_moisture == 30.5 and r.temperature == 22.0 for r in stored)
+
 class TestAIModels:
     """Test AI model endpoints"""
 
@@ -302,6 +356,14 @@ class TestAIModels:
         assert "data" in data
         assert "co2_sequestered" in data["data"]
 
+class TestResponseEncoding:
+    """Test the default response class"""
+
+    def test_uint256_values_fall_back_to_json(self):
+        """Test that integers orjson rejects are still encoded exactly"""
+        response = ORJSONFallbackResponse({"staked": 2 ** 200, "when": "now"})
+        assert response.body == b'{"staked":%d,"when":"now"}' % 2 ** 200
+
 class TestHealthCheck:
     """Test health check endpoint"""
 
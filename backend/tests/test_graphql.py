@@ -0,0 +1,348 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import strawberry.schema.execute
+from app.api.graphql import graphql_app, schema
+from app.core.cache import cache
+from app.api.loaders import create_loaders
+from app.core.security import create_access_token
+from app.database.config import Base, get_async_db
+from app.database.models import User, Loan
+
+# Test database setup
+engine = create_async_engine(
+    "sqlite+aiosqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+# main.py keeps the router unmounted, so the endpoint tests mount it on their own app
+app = FastAPI()
+app.include_router(graphql_app, prefix="/graphql")
+
+LOANS_QUERY = """
+    query Loans($limit: Int!, $after: String) {
+        loans(limit: $limit, after: $after) {
+            edges { cursor node { id amount } }
+            pageInfo { hasNextPage endCursor }
+        }
+    }
+"""
+
+LOANS_WITH_USERS_QUERY = """
+    query {
+        loans(limit: 50) {
+            edges { node { id user { id username } } }
+        }
+    }
+"""
+
+@pytest_asyncio.fixture
+async def test_db():
+    """Create a fresh database for each test"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with TestingSessionLocal() as db:
+        yield db
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+@pytest_asyncio.fixture
+async def test_loans(test_db):
+    """Create three users with two loans each; two loans share a created_at"""
+    users = [
+        User(email=f"farmer{i}@example.com", username=f"farmer{i}", hashed_password="x")
+        for i in range(3)
+    ]
+    test_db.add_all(users)
+    await test_db.flush()
+
+    base_time = datetime(2024, 1, 1)
+    created_at = [base_time + timedelta(days=i) for i in range(5)] + [base_time + timedelta(days=4)]
+    loans = [
+        Loan(
+            user_id=users[i % 3].id,
+            borrower_address=f"0x{i}",
+            amount=100.0 * (i + 1),
+            interest_rate=0.1,
+            duration=90,
+            collateral_token="USDC",
+            collateral_amount=150.0,
+            credit_score=700,
+            risk_level="Low",
+            trust_score=4,
+            total_owed=110.0,
+            created_at=when
+        )
+        for i, when in enumerate(created_at)
+    ]
+    test_db.add_all(loans)
+    await test_db.commit()
+    return loans
+
+async def execute(db: AsyncSession, query: str, viewer_id=None, **variables):
+    """Run a query against the schema with the same context the router builds"""
+    lock = asyncio.Lock()
+    context = {"db": db, "db_lock": lock, "viewer_id": viewer_id, **create_loaders(db, lock)}
+    return await schema.execute(query, variable_values=variables, context_value=context)
+
+async def post(payload: dict, token=None):
+    """POST to the mounted router with the test session factory"""
+    async def override_get_async_db():
+        async with TestingSessionLocal() as db:
+            yield db
+
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        client = TestClient(app)
+        return await asyncio.to_thread(client.post, "/graphql", json=payload, headers=headers)
+    finally:
+        del app.dependency_overrides[get_async_db]
+
+NESTED_LOANS_QUERY = """
+    query Nested($n: Int!) {
+        loans(limit: $n) { edges { node { user { loans { user { id } } } } } }
+    }
+"""
+
+NESTED_LOANS_LITERAL_QUERY = """
+    query {
+        loans(limit: 500) { edges { node { user { loans { user { id } } } } } }
+    }
+"""
+
+def _expected_order(loans):
+    """Newest first, ties broken by the higher id"""
+    return [loan.id for loan in sorted(loans, key=lambda loan: (loan.created_at, loan.id), reverse=True)]
+
+class TestPagination:
+    """Test keyset pagination cursors"""
+
+    @pytest.mark.asyncio
+    async def test_cursor_walks_every_row_once(self, test_db, test_loans):
+        """Test that following endCursor visits every loan once, newest first"""
+        seen = []
+        after = None
+        while True:
+            result = await execute(test_db, LOANS_QUERY, limit=4, after=after)
+            assert result.errors is None
+            page = result.data["loans"]
+            seen.extend(edge["node"]["id"] for edge in page["edges"])
+            assert page["pageInfo"]["endCursor"] == page["edges"][-1]["cursor"]
+            if not page["pageInfo"]["hasNextPage"]:
+                break
+            after = page["pageInfo"]["endCursor"]
+
+        assert seen == _expected_order(test_loans)
+
+    @pytest.mark.asyncio
+    async def test_cursor_resumes_after_tied_timestamp(self, test_db, test_loans):
+        """Test that a page boundary between rows with equal created_at skips nothing"""
+        first = await execute(test_db, LOANS_QUERY, limit=1)
+        after = first.data["loans"]["pageInfo"]["endCursor"]
+
+        second = await execute(test_db, LOANS_QUERY, limit=1, after=after)
+        expected = _expected_order(test_loans)
+        assert first.data["loans"]["edges"][0]["node"]["id"] == expected[0]
+        assert second.data["loans"]["edges"][0]["node"]["id"] == expected[1]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, test_db, test_loans):
+        """Test that a malformed cursor is rejected"""
+        result = await execute(test_db, LOANS_QUERY, limit=2, after="not-a-cursor")
+        assert result.errors[0].message == "Invalid cursor"
+
+class TestDataLoaders:
+    """Test request-scoped DataLoader batching"""
+
+    @pytest.mark.asyncio
+    async def test_loan_users_load_in_one_query(self, test_db, test_loans):
+        """Test that resolving every loan's user issues a single users query"""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            result = await execute(test_db, LOANS_WITH_USERS_QUERY)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        assert result.errors is None
+        edges = result.data["loans"]["edges"]
+        assert len(edges) == len(test_loans)
+        usernames = {loan.id: f"farmer{i % 3}" for i, loan in enumerate(test_loans)}
+        assert all(edge["node"]["user"]["username"] == usernames[edge["node"]["id"]] for edge in edges)
+        assert sum("FROM users" in statement for statement in statements) == 1
+
+class TestQueryLimits:
+    """Test the depth, token and cost validation rules"""
+
+    @pytest.mark.asyncio
+    async def test_deep_query_rejected(self, test_db):
+        """Test that a query nested past MAX_QUERY_DEPTH is rejected"""
+        nested = "user { loans { " * 5
+        query = f"{{ loans(limit: 1) {{ edges {{ node {{ {nested}id{' } }' * 5} }} }} }} }}"
+        result = await execute(test_db, query)
+        assert result.data is None
+        assert "exceeds maximum operation depth" in result.errors[0].message
+
+    @pytest.mark.asyncio
+    async def test_long_query_rejected(self, test_db):
+        """Test that a query past MAX_QUERY_TOKENS is rejected before validation"""
+        query = "{ " + " ".join(f"a{i}: users(limit: 1) {{ edges {{ node {{ id }} }} }}" for i in range(300)) + " }"
+        result = await execute(test_db, query)
+        assert result.data is None
+        assert "token" in result.errors[0].message.lower()
+
+    @pytest.mark.asyncio
+    async def test_literal_limit_cost_rejected(self, test_db):
+        """Test that a large literal limit multiplies the cost of nested lists"""
+        result = await execute(test_db, NESTED_LOANS_LITERAL_QUERY)
+        assert result.data is None
+        assert result.errors[0].message.startswith("Query cost 6501 exceeds")
+
+    @pytest.mark.asyncio
+    async def test_variable_limit_cost_rejected(self, test_db):
+        """Test that a variable limit is costed at the page size cap, whatever its value"""
+        result = await execute(test_db, NESTED_LOANS_QUERY, n=1)
+        assert result.data is None
+        assert result.errors[0].message.startswith("Query cost 6501 exceeds")
+
+    @pytest.mark.asyncio
+    async def test_small_query_allowed(self, test_db, test_loans):
+        """Test that an ordinary paginated query passes every limit"""
+        result = await execute(test_db, LOANS_WITH_USERS_QUERY)
+        assert result.errors is None
+
+class TestGraphQLEndpoint:
+    """Test the GraphQL router over HTTP"""
+
+    @pytest.mark.asyncio
+    async def test_query_over_http(self, test_db, test_loans):
+        """Test that /graphql serves queries with the request-scoped session"""
+        response = await post({"query": LOANS_QUERY, "variables": {"limit": 2}})
+
+        assert response.status_code == 200
+        data = response.json()["data"]["loans"]
+        assert [edge["node"]["id"] for edge in data["edges"]] == _expected_order(test_loans)[:2]
+        assert data["pageInfo"]["hasNextPage"] is True
+
+    @pytest.mark.asyncio
+    async def test_users_require_token(self, test_db, test_loans):
+        """Test that the users query is refused without a bearer token"""
+        response = await post({"query": "{ users { email } }"})
+
+        body = response.json()
+        assert body["data"] is None
+        assert body["errors"][0]["message"] == "Authentication required"
+
+    @pytest.mark.asyncio
+    async def test_listing_is_created_for_token_user(self, test_db, test_loans):
+        """Test that createMarketplaceListing sells as the user named by the token"""
+        mutation = """
+            mutation {
+                createMarketplaceListing(
+                    title: "Maize", description: null, cropType: "maize", quantity: 10,
+                    unit: "kg", pricePerUnit: 2.5, location: null, qualityGrade: null
+                ) { sellerId }
+            }
+        """
+        response = await post({"query": mutation}, token=create_access_token(data={"sub": "farmer2"}))
+
+        body = response.json()
+        assert "errors" not in body
+        # farmer2 borrowed the third loan
+        assert body["data"]["createMarketplaceListing"]["sellerId"] == test_loans[2].user_id
+
+class TestResultCache:
+    """Test the router's query result cache"""
+
+    @pytest.fixture
+    def result_store(self, monkeypatch):
+        """Replace the Redis result cache with a dict, recording lookups"""
+        store, lookups = {}, []
+
+        async def get_query_result(result_key):
+            lookups.append(result_key)
+            return store.get(result_key)
+
+        async def set_query_result(result_key, data):
+            store[result_key] = data
+            return True
+
+        monkeypatch.setattr(cache, "get_query_result", get_query_result)
+        monkeypatch.setattr(cache, "set_query_result", set_query_result)
+        return store, lookups
+
+    @pytest.mark.asyncio
+    async def test_results_are_cached_per_viewer(self, test_db, test_loans, result_store):
+        """Test that the same query is cached separately for each viewer"""
+        store, _ = result_store
+        payload = {"query": LOANS_QUERY, "variables": {"limit": 2}}
+
+        await post(payload)
+        await post(payload, token=create_access_token(data={"sub": "farmer0"}))
+        await post(payload)
+
+        assert len(store) == 2
+
+    @pytest.mark.asyncio
+    async def test_mutations_skip_cache_lookup(self, test_db, test_loans, result_store):
+        """Test that mutations neither read nor write the result cache"""
+        store, lookups = result_store
+        token = create_access_token(data={"sub": "farmer0"})
+
+        response = await post({"query": "mutation { repayLoan(loanId: 1, amount: 5) { success } }"}, token=token)
+
+        assert response.json()["data"]["repayLoan"]["success"] is True
+        assert lookups == [] and store == {}
+
+    @pytest.mark.asyncio
+    async def test_query_is_parsed_once(self, test_db, test_loans, result_store, monkeypatch):
+        """Test that execution reuses the router's parsed document"""
+        def parse_document(*args, **kwargs):
+            raise AssertionError("query parsed twice")
+
+        monkeypatch.setattr(strawberry.schema.execute, "parse_document", parse_document)
+        response = await post({"query": LOANS_QUERY, "variables": {"limit": 2}})
+
+        assert len(response.json()["data"]["loans"]["edges"]) == 2
+
+class TestMutations:
+    """Test mutation result types and authentication"""
+
+    @pytest.mark.asyncio
+    async def test_repay_loan(self, test_db):
+        """Test that mutations resolve to typed results"""
+        result = await execute(
+            test_db,
+            "mutation { repayLoan(loanId: 1, amount: 50) { success message remainingBalance } }",
+            viewer_id=1
+        )
+        assert result.errors is None
+        assert result.data["repayLoan"] == {
+            "success": True,
+            "message": "Repayment of 50.0 processed",
+            "remainingBalance": 0.0
+        }
+
+    @pytest.mark.asyncio
+    async def test_mutation_requires_viewer(self, test_db):
+        """Test that mutations are rejected without an authenticated user"""
+        result = await execute(
+            test_db, "mutation { repayLoan(loanId: 1, amount: 50) { success } }"
+        )
+        assert result.data is None
+        assert result.errors[0].message == "Authentication required"
@@ -42,6 +42,7 @@ DROP FUNCTION IF EXISTS update_updated_at_column() CASCADE;
 DROP FUNCTION IF EXISTS verify_rls_setup() CASCADE;
 
 -- Step 5: Drop extensions (optional - only if not used elsewhere)
+-- DROP EXTENSION IF EXISTS "pg_trgm" CASCADE;
 -- DROP EXTENSION IF EXISTS "pgcrypto" CASCADE;
 -- DROP EXTENSION IF EXISTS "uuid-ossp" CASCADE;
 
@@ -75,6 +76,7 @@ DROP INDEX IF EXISTS idx_governance_votes_proposal_id CASCADE;
 DROP INDEX IF EXISTS idx_governance_proposals_state CASCADE;
 DROP INDEX IF EXISTS idx_governance_proposals_proposer_address CASCADE;
 DROP INDEX IF EXISTS idx_governance_proposals_proposal_id CASCADE;
+DROP INDEX IF EXISTS idx_carbon_credits_user_created_at CASCADE;
 DROP INDEX IF EXISTS idx_carbon_credits_transaction_hash CASCADE;
 DROP INDEX IF EXISTS idx_carbon_credits_transaction_type CASCADE;
 DROP INDEX IF EXISTS idx_carbon_credits_user_id CASCADE;
@@ -83,11 +85,16 @@ DROP INDEX IF EXISTS idx_notifications_created_at CASCADE;
 DROP INDEX IF EXISTS idx_notifications_is_read CASCADE;
 DROP INDEX IF EXISTS idx_notifications_type CASCADE;
 DROP INDEX IF EXISTS idx_notifications_user_id CASCADE;
+DROP INDEX IF EXISTS idx_marketplace_listings_status_crop_created_at CASCADE;
+DROP INDEX IF EXISTS idx_marketplace_listings_status_created_at CASCADE;
+DROP INDEX IF EXISTS idx_marketplace_listings_location_trgm CASCADE;
 DROP INDEX IF EXISTS idx_marketplace_listings_created_at CASCADE;
 DROP INDEX IF EXISTS idx_marketplace_listings_status CASCADE;
 DROP INDEX IF EXISTS idx_marketplace_listings_location CASCADE;
 DROP INDEX IF EXISTS idx_marketplace_listings_crop_type CASCADE;
 DROP INDEX IF EXISTS idx_marketplace_listings_seller_id CASCADE;
+DROP INDEX IF EXISTS idx_loans_user_created_at CASCADE;
+DROP INDEX IF EXISTS idx_loans_status_created_at CASCADE;
 DROP INDEX IF EXISTS idx_loans_created_at CASCADE;
 DROP INDEX IF EXISTS idx_loans_status CASCADE;
 DROP INDEX IF EXISTS idx_loans_user_id CASCADE;
@@ -98,6 +105,7 @@ DROP INDEX IF EXISTS idx_sensor_readings_timestamp CASCADE;
 DROP INDEX IF EXISTS idx_sensor_readings_device_id CASCADE;
 DROP INDEX IF EXISTS idx_sensor_devices_owner_id CASCADE;
 DROP INDEX IF EXISTS idx_sensor_devices_device_id CASCADE;
+DROP INDEX IF EXISTS idx_users_location_trgm CASCADE;
 DROP INDEX IF EXISTS idx_users_role CASCADE;
 DROP INDEX IF EXISTS idx_users_username CASCADE;
 DROP INDEX IF EXISTS idx_users_email CASCADE;
@@ -8,6 +8,7 @@
 -- Enable necessary extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 -- Create custom types
 DO $$ BEGIN
@@ -388,6 +389,7 @@ ALTER TABLE cross_chain_transactions ENABLE ROW LEVEL SECURITY;
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
 CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
+CREATE INDEX IF NOT EXISTS idx_users_location_trgm ON users USING gin (location gin_trgm_ops);
 
 CREATE INDEX IF NOT EXISTS idx_sensor_devices_device_id ON sensor_devices(device_id);
 CREATE INDEX IF NOT EXISTS idx_sensor_devices_owner_id ON sensor_devices(owner_id);
@@ -403,12 +405,17 @@ CREATE INDEX IF NOT EXISTS idx_yield_predictions_user_id ON yield_predictions(us
 CREATE INDEX IF NOT EXISTS idx_loans_user_id ON loans(user_id);
 CREATE INDEX IF NOT EXISTS idx_loans_status ON loans(status);
 CREATE INDEX IF NOT EXISTS idx_loans_created_at ON loans(created_at);
+CREATE INDEX IF NOT EXISTS idx_loans_status_created_at ON loans(status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_loans_user_created_at ON loans(user_id, created_at DESC);
 
 CREATE INDEX IF NOT EXISTS idx_marketplace_listings_seller_id ON marketplace_listings(seller_id);
 CREATE INDEX IF NOT EXISTS idx_marketplace_listings_crop_type ON marketplace_listings(crop_type);
 CREATE INDEX IF NOT EXISTS idx_marketplace_listings_location ON marketplace_listings(location);
 CREATE INDEX IF NOT EXISTS idx_marketplace_listings_status ON marketplace_listings(status);
 CREATE INDEX IF NOT EXISTS idx_marketplace_listings_created_at ON marketplace_listings(created_at);
+CREATE INDEX IF NOT EXISTS idx_marketplace_listings_location_trgm ON marketplace_listings USING gin (location gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_marketplace_listings_status_created_at ON marketplace_listings(status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_marketplace_listings_status_crop_created_at ON marketplace_listings(status, crop_type, created_at DESC);
 
 CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications(user_id);
 CREATE INDEX IF NOT EXISTS idx_notifications_type ON notifications(type);
@@ -419,6 +426,7 @@ CREATE INDEX IF NOT EXISTS idx_notifications_user_unread ON notifications(user_i
 CREATE INDEX IF NOT EXISTS idx_carbon_credits_user_id ON carbon_credits(user_id);
 CREATE INDEX IF NOT EXISTS idx_carbon_credits_transaction_type ON carbon_credits(transaction_type);
 CREATE INDEX IF NOT EXISTS idx_carbon_credits_transaction_hash ON carbon_credits(transaction_hash);
+CREATE INDEX IF NOT EXISTS idx_carbon_credits_user_created_at ON carbon_credits(user_id, created_at DESC);
 
 CREATE INDEX IF NOT EXISTS idx_governance_proposals_proposal_id ON governance_proposals(proposal_id);
 CREATE INDEX IF NOT EXISTS idx_governance_proposals_proposer_address ON governance_proposals(proposer_address);